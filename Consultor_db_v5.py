@@ -1,8 +1,3 @@
-import mysql.connector
-import tkinter as tk
-from tkinter import ttk, messagebox
-import smtplib
-from email.message import EmailMessage
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -142,6 +137,8 @@ PLANTILLA_EMAIL = """<!DOCTYPE html>
 
 # ---------------- DB ----------------
 def conectar_db():
+    import mysql.connector
+
     return mysql.connector.connect(**DB_CONFIG)
 
 
@@ -449,6 +446,9 @@ def obtener_estados_email():
 
 # ---------------- EMAIL ----------------
 def enviar_email(destinatario, asunto, cuerpo_html):
+    import smtplib
+    from email.message import EmailMessage
+
     msg = EmailMessage()
     msg["From"] = SMTP_USER
     msg["To"] = destinatario
@@ -480,6 +480,9 @@ def generar_saludo(nombre_empresa):
 
 # ---------------- GUI ----------------
 def lanzar_gui():
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+
     root = tk.Tk()
     root.title("Consultor de Empresas")
     root.geometry("700x500")
@@ -769,5 +772,17 @@ def lanzar_gui():
     root.mainloop()
 
 
+def imprimir_estados_email():
+    for fila in obtener_estados_email():
+        estado = fila.get("descripcion") or fila.get("id_estado") or "-"
+        print(f"{str(estado):<20} {str(fila['email']):<40} {fila['nombre']}")
+
+
 if __name__ == "__main__":
-    lanzar_gui()
+    import sys
+
+    if "--estados" in sys.argv[1:]:
+        # Sin interfaz: lista el estado de envío de cada email
+        imprimir_estados_email()
+    else:
+        lanzar_gui()
@@ -1,10 +1,11 @@
 import requests
-from bs4 import BeautifulSoup
 import time
 import random
 import re
 import json
 
+from parser_html import crear_soup
+
 URL = "https://www.paginasamarillas.es/search/asesorias-y-gestorias/all-ma/madrid/all-is/coslada/all-ba/all-pu/all-nc/1?what=asesorias+y+gestorias&where=coslada&qc=true"
 
 HEADERS = {
@@ -15,7 +16,7 @@ HEADERS = {
 response = requests.get(URL, headers=HEADERS, timeout=15)
 response.raise_for_status()
 
-soup = BeautifulSoup(response.text, "html.parser")
+soup = crear_soup(response.text)
 
 empresas_html = soup.find_all("div", class_="box")
 print(f"Empresas encontradas: {len(empresas_html)}")
@@ -1,22 +1,23 @@
-import json
+import os
 import queue
 import random
 import re
+import shutil
 import subprocess
 import threading
 import time
 from pathlib import Path
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
-import tkinter as tk
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from tkinter import messagebox, ttk
+import sesion_http
+from checkpoint import Checkpoint
+from cortesia import PlanificadorCortesia
+from escaner import buscar_telefono
+from indice_empresas import clave_url, claves_empresa, indice_global
+from limitador import limitador_global
+from metricas import MetricasEjecucion
+from parser_html import parsear
+from salida_jsonl import SalidaJSONL, convertir_a_json
 
 
 OUTPUT_DIR = Path("resultados")
@@ -35,15 +36,63 @@ EXCLUDE_HTML_PAGES = {
     "contacto.html",
     "about.html",
 }
+# Enlaces de un listado que pueden llevar a una ficha; extraer_url_ficha_empresite
+# decide despues cuales lo son
+SELECTOR_FICHAS_LISTADO = (
+    'a[onclick*="location.href"], a[href$=".html"], a[href*="/empresa/"], a[href*="/EMPRESA/"]'
+)
 
 CHROME_PROFILE_DIR = Path("selenium_profile_empresite")
+# Navegadores que abren fichas a la vez; cada uno con su copia del perfil.
+# El limitador global por host sigue marcando el ritmo total.
+DRIVERS_FICHAS = 1
 DETAIL_DELAY_SECONDS = (3.0, 7.0)
 PAGE_DELAY_SECONDS = (6.0, 12.0)
 COOLDOWN_EVERY_N_DETAILS = 4
 COOLDOWN_SECONDS = (45.0, 120.0)
+# Carga de paginas: "eager" devuelve el control en DOMContentLoaded y la
+# espera sigue solo hasta que aparece lo que el extractor necesita; si la
+# pagina no lo tiene (listado vacio, ficha sin contacto) manda el fin de la
+# carga completa (readyState "complete")
+CARGA_PAGINA = "eager"
+# En la espera del listado los .html fijos del pie (faqs, aviso legal...) no
+# cuentan: estan en todas las paginas, haya resultados o no
+LISTO_SELECTORES = {
+    "listado": SELECTOR_FICHAS_LISTADO.replace(
+        'a[href$=".html"]',
+        'a[href$=".html"]' + "".join(f':not([href$="{p}"])' for p in sorted(EXCLUDE_HTML_PAGES)),
+    ),
+    "ficha": "a.email[href^='mailto:'], a.url[href], a[href^='tel:']",
+}
 BROWSER_HIDDEN_POS = (-32000, -32000)  # Windows: off-screen
 BROWSER_VISIBLE_POS = (60, 60)
 BROWSER_VISIBLE_SIZE = (1200, 900)
+# Navegador ligero: headless, ventana pequena y sin imagenes, multimedia,
+# fuentes ni CSS (los extractores solo leen el HTML). Si hace falta que el
+# usuario resuelva un bloqueo se abre aparte un navegador visible.
+NAVEGADOR_LIGERO = False
+LIGERO_VENTANA = (1024, 768)
+LIGERO_EXTENSIONES_BLOQUEADAS = (
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "mp3", "ogg", "css",
+)
+# Patrones de Network.setBlockedURLs (casan con la URL entera): con y sin
+# query, porque los recursos suelen ir versionados (style.css?v=3)
+LIGERO_BLOQUEADOS = [
+    patron
+    for ext in LIGERO_EXTENSIONES_BLOQUEADAS
+    for patron in (f"*.{ext}", f"*.{ext}?*")
+]
+COMPRIMIR_SALIDA = False  # True: el streaming de empresas va a .jsonl.gz
+# Modo hibrido: el navegador abre la sesion y los listados; las fichas se piden
+# por HTTP con sus cookies y su User-Agent, y se vuelve al navegador si la
+# respuesta no parece una ficha. El ritmo lo marca solo el limitador por host.
+FICHAS_POR_HTTP = False
+FICHA_HTTP_TIMEOUT = 20
+# Origen del sitio; SCRAPER_ORIGEN_EMPRESITE lo apunta a un servidor local de pruebas
+ORIGEN_EMPRESITE = os.getenv("SCRAPER_ORIGEN_EMPRESITE", "https://empresite.eleconomista.es").rstrip("/")
+HOST_EMPRESITE = urlparse(ORIGEN_EMPRESITE).netloc.lower()
 
 def aplicar_filtros_empresite(base_url, solo_con_email):
     """
@@ -206,12 +255,12 @@ def extraer_url_ficha_empresite(anchor):
     if not url:
         return None
     if url.startswith("/"):
-        url = f"https://empresite.eleconomista.es{url}"
+        url = f"{ORIGEN_EMPRESITE}{url}"
     if not url.lower().startswith("http"):
         return None
 
     parsed = urlparse(url)
-    if "empresite.eleconomista.es" not in parsed.netloc.lower():
+    if HOST_EMPRESITE not in parsed.netloc.lower():
         return None
 
     path = (parsed.path or "").lower()
@@ -240,11 +289,51 @@ def nombre_desde_url_ficha(detail_url):
         return "No disponible"
 
 
-def crear_driver(use_profile=True):
+def directorio_perfil(n):
+    """
+    Perfil de Chrome del navegador n del pool: el 0 usa CHROME_PROFILE_DIR y
+    el resto una copia (Chrome no deja compartir un perfil abierto), sin
+    caches ni ficheros de bloqueo. Se recopia en cada arranque para heredar
+    las cookies y el consentimiento del perfil principal.
+    """
+    if n == 0:
+        return CHROME_PROFILE_DIR
+    destino = CHROME_PROFILE_DIR.with_name(f"{CHROME_PROFILE_DIR.name}_{n}")
+    if CHROME_PROFILE_DIR.exists():
+        shutil.copytree(
+            CHROME_PROFILE_DIR, destino, dirs_exist_ok=True,
+            ignore=shutil.ignore_patterns(
+                "Singleton*", "lockfile", "LOCK", "*.lock", "Cache", "Code Cache", "GPUCache",
+                "Service Worker", "ShaderCache", "GrShaderCache",
+            ),
+        )
+    return destino
+
+
+def crear_driver(use_profile=True, perfil=CHROME_PROFILE_DIR, ligero=NAVEGADOR_LIGERO):
+    # Selenium solo se importa al crear el primer navegador (arranque rapido
+    # en los hosts sin pantalla que solo usan el parseo o el modo lote).
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
     options = Options()
-    # Start off-screen to avoid flashing in the middle of the screen.
-    options.add_argument(f"--window-position={BROWSER_HIDDEN_POS[0]},{BROWSER_HIDDEN_POS[1]}")
-    options.add_argument("--window-size=900,700")
+    if ligero:
+        options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={LIGERO_VENTANA[0]},{LIGERO_VENTANA[1]}")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+        options.add_argument("--disable-extensions")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.media_stream": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+    else:
+        # Start off-screen to avoid flashing in the middle of the screen.
+        options.add_argument(f"--window-position={BROWSER_HIDDEN_POS[0]},{BROWSER_HIDDEN_POS[1]}")
+        options.add_argument("--window-size=900,700")
+    options.page_load_strategy = CARGA_PAGINA
     options.add_argument("--log-level=3")
     options.add_argument("--disable-logging")
     options.add_argument("--disable-blink-features=AutomationControlled")
@@ -255,15 +344,38 @@ def crear_driver(use_profile=True):
 
     if use_profile:
         # Persistir cookies/sesión reduce banners repetidos y a veces baja captchas.
-        CHROME_PROFILE_DIR.mkdir(exist_ok=True)
-        options.add_argument(f"--user-data-dir={CHROME_PROFILE_DIR.resolve()}")
+        perfil = Path(perfil)
+        perfil.mkdir(exist_ok=True)
+        options.add_argument(f"--user-data-dir={perfil.resolve()}")
         options.add_argument("--profile-directory=Default")
 
     service = Service(log_output=subprocess.DEVNULL)
-    return webdriver.Chrome(options=options, service=service)
+    driver = webdriver.Chrome(options=options, service=service)
+    driver.ligero = ligero
+    if ligero:
+        aligerar_driver(driver)
+    return driver
+
+
+def aligerar_driver(driver):
+    """
+    Bloqueo por CDP de fuentes, multimedia, CSS e imagenes (las preferencias
+    de contenido no cubren fuentes ni CSS) y User-Agent sin "HeadlessChrome".
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LIGERO_BLOQUEADOS})
+        agente = driver.execute_script("return navigator.userAgent;")
+        driver.execute_cdp_cmd(
+            "Network.setUserAgentOverride", {"userAgent": agente.replace("HeadlessChrome", "Chrome")}
+        )
+    except Exception:
+        return
 
 
 def ocultar_navegador(driver):
+    if getattr(driver, "ligero", False):
+        return
     try:
         driver.set_window_position(BROWSER_HIDDEN_POS[0], BROWSER_HIDDEN_POS[1])
         driver.minimize_window()
@@ -280,50 +392,111 @@ def mostrar_navegador(driver):
         return
 
 
-def intentar_aceptar_cookies(driver, log_func, timeout=6):
+COOKIES_LABELS = [
+    "Aceptar",
+    "Aceptar todo",
+    "Aceptar todas",
+    "Aceptar cookies",
+    "Estoy de acuerdo",
+    "Acepto",
+    "Allow all",
+    "Accept all",
+    "I agree",
+]
+COOKIES_ESPERA_SECONDS = 1.0  # margen para banners que se inyectan tras la carga
+# Paginas cargadas del todo (readyState "complete") sin banner tras las que se
+# deja de buscarlo en esa sesion: con carga eager el banner puede llegar tarde
+COOKIES_PAGINAS_SIN_BANNER = 2
+# Coste de la version anterior (un WebDriverWait de 3s por etiqueta) en una
+# pagina sin banner; solo para informar del ahorro en el log
+COOKIES_COSTE_ANTERIOR_SECONDS = len(COOKIES_LABELS) * 3
+
+# Busca y pulsa el banner dentro de la pagina, en una sola llamada al driver:
+# prueba las etiquetas por orden sobre botones y enlaces visibles y reintenta
+# cada 150 ms hasta el plazo. Devuelve {pulsada: etiqueta o null, completa:
+# si la pagina habia terminado de cargar}.
+_JS_ACEPTAR_COOKIES = """
+var etiquetas = arguments[0], limite = Date.now() + arguments[1] * 1000;
+var hecho = arguments[arguments.length - 1];
+function visible(el) {
+    var r = el.getBoundingClientRect();
+    var estilo = window.getComputedStyle(el);
+    return r.width > 0 && r.height > 0 && estilo.visibility !== "hidden" && !el.disabled;
+}
+function buscar() {
+    var nodos = document.querySelectorAll("button, a");
+    var textos = [];
+    for (var i = 0; i < nodos.length; i++) {
+        textos.push((nodos[i].textContent || "").replace(/\\s+/g, " ").trim().toLowerCase());
+    }
+    for (var j = 0; j < etiquetas.length; j++) {
+        for (var k = 0; k < nodos.length; k++) {
+            if (textos[k].indexOf(etiquetas[j]) !== -1 && visible(nodos[k])) {
+                nodos[k].click();
+                return etiquetas[j];
+            }
+        }
+    }
+    return null;
+}
+(function intentar() {
+    var pulsada = null;
+    try { pulsada = buscar(); } catch (e) {}
+    if (pulsada || Date.now() >= limite) {
+        hecho({pulsada: pulsada, completa: document.readyState === "complete"});
+    } else {
+        setTimeout(intentar, 150);
+    }
+})();
+"""
+
+# session_id -> etiqueta pulsada, o None si no hubo banner en
+# COOKIES_PAGINAS_SIN_BANNER paginas completas: la cookie de consentimiento
+# (o su ausencia) vale para el resto de la sesion
+_COOKIES_COMPROBADAS = {}
+# session_id -> paginas completas sin banner, mientras no llegan al limite
+_COOKIES_SIN_BANNER = {}
+_lock_cookies = threading.Lock()
+
+
+def cookies_comprobadas(driver):
+    with _lock_cookies:
+        return driver.session_id in _COOKIES_COMPROBADAS
+
+
+def intentar_aceptar_cookies(driver, log_func, timeout=COOKIES_ESPERA_SECONDS, forzar=False):
     """
-    Intenta cerrar/aceptar banners de cookies comunes.
+    Intenta cerrar/aceptar banners de cookies comunes con una unica
+    comprobacion en la pagina. Se deja de mirar en la sesion del driver en
+    cuanto se acepta uno, o tras COOKIES_PAGINAS_SIN_BANNER paginas cargadas
+    del todo sin banner; con forzar se mira igualmente (p.ej. en un bloqueo).
     """
-    labels = [
-        "Aceptar",
-        "Aceptar todo",
-        "Aceptar todas",
-        "Aceptar cookies",
-        "Estoy de acuerdo",
-        "Acepto",
-        "Allow all",
-        "Accept all",
-        "I agree",
-    ]
-
-    for texto in labels:
-        xpath = (
-            "//button[contains(translate(normalize-space(.),"
-            "'ABCDEFGHIJKLMNOPQRSTUVWXYZÁÉÍÓÚÜ',"
-            "'abcdefghijklmnopqrstuvwxyzáéíóúü'),"
-            f"'{texto.lower()}')]"
-            "|"
-            "//a[contains(translate(normalize-space(.),"
-            "'ABCDEFGHIJKLMNOPQRSTUVWXYZÁÉÍÓÚÜ',"
-            "'abcdefghijklmnopqrstuvwxyzáéíóúü'),"
-            f"'{texto.lower()}')]"
+    if not forzar:
+        with _lock_cookies:
+            if driver.session_id in _COOKIES_COMPROBADAS:
+                return _COOKIES_COMPROBADAS[driver.session_id] is not None
+    try:
+        resultado = driver.execute_async_script(
+            _JS_ACEPTAR_COOKIES, [t.lower() for t in COOKIES_LABELS], timeout
         )
-        try:
-            elems = WebDriverWait(driver, timeout).until(
-                EC.presence_of_all_elements_located((By.XPATH, xpath))
-            )
-            for elem in elems:
-                if elem.is_displayed() and elem.is_enabled():
-                    try:
-                        driver.execute_script("arguments[0].click();", elem)
-                    except Exception:
-                        elem.click()
-                    time.sleep(0.6)
-                    log_func("Banner de cookies aceptado automaticamente.")
-                    return True
-        except Exception:
-            continue
-    return False
+    except Exception:
+        return False
+    pulsada = (resultado or {}).get("pulsada")
+    with _lock_cookies:
+        sesion = driver.session_id
+        if pulsada:
+            _COOKIES_COMPROBADAS[sesion] = pulsada
+            _COOKIES_SIN_BANNER.pop(sesion, None)
+        elif resultado and resultado.get("completa") and sesion not in _COOKIES_COMPROBADAS:
+            _COOKIES_SIN_BANNER[sesion] = _COOKIES_SIN_BANNER.get(sesion, 0) + 1
+            if _COOKIES_SIN_BANNER[sesion] >= COOKIES_PAGINAS_SIN_BANNER:
+                _COOKIES_COMPROBADAS[sesion] = None
+                del _COOKIES_SIN_BANNER[sesion]
+    if not pulsada:
+        return False
+    time.sleep(0.6)
+    log_func(f"Banner de cookies aceptado automaticamente ('{pulsada}'); no se vuelve a comprobar.")
+    return True
 
 
 def humanizar_pagina(driver):
@@ -339,41 +512,140 @@ def humanizar_pagina(driver):
         return
 
 
-def esperar_y_obtener_html(driver, url, log_func, timeout=25):
-    driver.get(url)
+# Espera en la pagina, en una sola llamada al driver, a lo primero de: los
+# datos (selector) o el fin de la carga completa.
+_JS_ESPERAR_LISTO = """
+var datos = arguments[0], limite = Date.now() + arguments[1] * 1000;
+var hecho = arguments[arguments.length - 1];
+(function mirar() {
+    var estado = null;
+    try {
+        if (document.querySelector(datos)) { estado = "datos"; }
+        else if (document.readyState === "complete") { estado = "completa"; }
+    } catch (e) {}
+    if (estado || Date.now() >= limite) { hecho(estado || "plazo"); } else { setTimeout(mirar, 100); }
+})();
+"""
+
+
+def esperar_lista(driver, tipo, timeout=25):
+    """
+    Espera a que la pagina (tipo "listado" o "ficha") tenga lo que necesita
+    el extractor. Devuelve "datos", "completa" o "plazo".
+    """
     try:
-        WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        return driver.execute_async_script(_JS_ESPERAR_LISTO, LISTO_SELECTORES[tipo], timeout)
     except Exception:
-        pass
-    intentar_aceptar_cookies(driver, log_func, timeout=3)
-    humanizar_pagina(driver)
-    time.sleep(random.uniform(1.0, 2.5))
-    html = driver.page_source or ""
+        return "plazo"
+
+
+def crear_cortesia(metricas=None, log_func=None):
+    """Planificador de pausas de un navegador con los tiempos de este scraper."""
+    return PlanificadorCortesia(
+        {"ficha": DETAIL_DELAY_SECONDS, "pagina": PAGE_DELAY_SECONDS},
+        cooldown_cada=COOLDOWN_EVERY_N_DETAILS,
+        cooldown=COOLDOWN_SECONDS,
+        metricas=metricas,
+        log_func=log_func,
+    )
+
+
+def esperar_y_obtener_html(driver, url, log_func, timeout=25, metricas=None, etapa="descarga"):
+    """
+    Navega a `url` y devuelve (html, ok) en cuanto estan los datos del tipo
+    de pagina (etapa "ficha" o descarga de listado); si en `timeout` no
+    estan ni ha terminado la carga, ok es False. Las pausas de cortesia
+    no estan aqui: si el driver tiene planificador (driver.cortesia) se espera
+    su turno antes de navegar y se programa la siguiente pausa al terminar.
+    Con `metricas` (MetricasEjecucion) reparte el tiempo entre la etapa,
+    limitador, cookies y espera.
+    """
+    if metricas is None:
+        metricas = MetricasEjecucion("empresite", url)
+    tipo = "ficha" if etapa == "ficha" else "listado"
+    cortesia = getattr(driver, "cortesia", None)
+
+    if cortesia is not None:
+        # El scroll "humano" sobre la pagina anterior se hace dentro de la pausa
+        cortesia.esperar(mientras=lambda: humanizar_pagina(driver))
+    # Mismo presupuesto por host que las descargas HTTP (compartido entre hilos)
+    metricas.sumar("limitador", limitador_global().esperar(url))
+    with metricas.etapa(etapa):
+        driver.get(url)
+        listo = esperar_lista(driver, tipo, timeout)
+    with metricas.etapa("cookies"):
+        intentar_aceptar_cookies(driver, log_func)
+    with metricas.etapa(etapa):
+        html = driver.page_source or ""
+    if cortesia is not None:
+        cortesia.programar(tipo)
     if es_pagina_captcha_html(html):
-        mostrar_navegador(driver)
-        log_func(
-            "Bloqueo detectado (captcha o muro). "
-            "Revisa/acepta cookies o captcha en navegador; espero hasta 240s."
-        )
-        start = time.time()
-        while time.time() - start < 240:
-            time.sleep(4)
-            intentar_aceptar_cookies(driver, log_func, timeout=1)
-            html = driver.page_source or ""
-            if not es_pagina_captcha_html(html):
-                log_func("Bloqueo resuelto. Continuando...")
-                ocultar_navegador(driver)
-                return html, True
-        log_func("No se resolvio captcha/cookies a tiempo. Parando scraping.")
+        metricas.contar("bloqueos")
+        with metricas.etapa("bloqueo"):
+            if getattr(driver, "ligero", False):
+                return resolver_en_visible(driver, url, log_func)
+            return esperar_desbloqueo(driver, log_func)
+    if listo == "plazo":
+        # Ni datos ni carga completa: el HTML puede estar a medias
+        metricas.contar("plazos_carga")
+        log_func(f"La pagina no termino de cargar en {timeout}s: {url}")
         return html, False
     return html, True
 
 
-def extraer_datos_ficha_desde_html(html):
+def esperar_desbloqueo(driver, log_func):
+    """Muestra el navegador y espera a que el usuario resuelva el bloqueo."""
+    mostrar_navegador(driver)
+    log_func(
+        "Bloqueo detectado (captcha o muro). "
+        "Revisa/acepta cookies o captcha en navegador; espero hasta 240s."
+    )
+    html = driver.page_source or ""
+    start = time.time()
+    while time.time() - start < 240:
+        time.sleep(4)
+        intentar_aceptar_cookies(driver, log_func, timeout=1, forzar=True)
+        html = driver.page_source or ""
+        if not es_pagina_captcha_html(html):
+            log_func("Bloqueo resuelto. Continuando...")
+            ocultar_navegador(driver)
+            return html, True
+    log_func("No se resolvio captcha/cookies a tiempo. Parando scraping.")
+    return html, False
+
+
+def _copiar_cookies(origen, destino):
+    for c in origen.get_cookies():
+        c.pop("sameSite", None)
+        try:
+            destino.add_cookie(c)
+        except Exception:
+            continue
+
+
+def resolver_en_visible(driver, url, log_func):
+    """
+    Un navegador headless no se puede mostrar: se abre uno visible (sin
+    perfil, el del headless esta en uso) con sus cookies, se espera ahi a
+    que se resuelva el bloqueo y las cookies resultantes vuelven al headless.
+    """
+    log_func("Navegador ligero bloqueado: abriendo un navegador visible para resolverlo.")
+    visible = crear_driver(use_profile=False, ligero=False)
+    try:
+        visible.get(ORIGEN_EMPRESITE)
+        _copiar_cookies(driver, visible)
+        visible.get(url)
+        html, ok = esperar_desbloqueo(visible, log_func)
+        if ok:
+            _copiar_cookies(visible, driver)
+        return html, ok
+    finally:
+        visible.quit()
+
+
+def extraer_datos_ficha_desde_html(html, backend=None):
     datos = {"email": "No disponible", "web": "No disponible", "telefono": "No disponible"}
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parsear(html, backend)
 
     email_a = soup.select_one("a.email[href^='mailto:']")
     if email_a:
@@ -391,114 +663,352 @@ def extraer_datos_ficha_desde_html(html):
         datos["telefono"] = normalizar_telefono(tel_a.get("href", "").replace("tel:", "").strip())
     else:
         txt = soup.get_text(" ", strip=True)
-        mt = telefono_regex.search(txt)
-        if mt:
-            datos["telefono"] = normalizar_telefono(mt.group())
+        telefono = buscar_telefono(txt)
+        if telefono:
+            datos["telefono"] = normalizar_telefono(telefono)
 
     return datos
 
 
-def iniciar_scraping_empresite(base_url, max_paginas, log_func, use_profile=True):
+def sesion_desde_driver(driver, sesion=None):
+    """
+    Sesion HTTP con pool keep-alive que se presenta como el navegador:
+    mismo User-Agent y sus cookies. Con `sesion` solo le copia las cookies.
+    """
+    if sesion is None:
+        headers = dict(sesion_http.HEADERS)
+        headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+        headers["Accept"] = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+        sesion = sesion_http.crear_sesion({"reintentos": 1}, headers=headers)
+    for c in driver.get_cookies():
+        sesion.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+    return sesion
+
+
+def descargar_ficha_http(sesion, url, metricas, timeout=FICHA_HTTP_TIMEOUT):
+    """
+    Datos de la ficha pedida por HTTP, o None si la respuesta no parece una
+    ficha (error, redireccion fuera del sitio, captcha o sin ningun dato) y
+    hay que abrirla en el navegador.
+    """
+    metricas.sumar("limitador", limitador_global().esperar(url))
+    with metricas.etapa("ficha_http"):
+        try:
+            r = sesion.get(url, timeout=timeout)
+        except Exception:
+            return None
+    if r.status_code != 200 or HOST_EMPRESITE not in urlparse(r.url).netloc.lower():
+        return None
+    html = r.text
+    if es_pagina_captcha_html(html):
+        return None
+    with metricas.etapa("parseo"):
+        ficha = extraer_datos_ficha_desde_html(html)
+    if all(v == "No disponible" for v in ficha.values()):
+        return None
+    return ficha
+
+
+def extraer_fichas_listado(html, backend=None):
+    """
+    Devuelve (anchors, detail_urls) de una pagina de listado; detail_urls son
+    tuplas (url_ficha, texto, title) sin repetir, en orden de aparicion.
+    """
+    soup = parsear(html, backend)
+    anchors = soup.select(SELECTOR_FICHAS_LISTADO)
+    detail_urls = []
+    seen_page = set()
+    for a in anchors:
+        detail = extraer_url_ficha_empresite(a)
+        if detail and detail not in seen_page:
+            seen_page.add(detail)
+            detail_urls.append((detail, a.get_text(" ", strip=True), a.get("title", "")))
+    return anchors, detail_urls
+
+
+def iniciar_scraping_empresite(base_url, max_paginas, log_func, use_profile=True, salida=None,
+                               checkpoint=None, indice=None, refrescar=False, metricas=None,
+                               fichas_http=FICHAS_POR_HTTP, drivers=DRIVERS_FICHAS,
+                               ligero=NAVEGADOR_LIGERO):
+    """
+    Con `salida` (SalidaJSONL) cada empresa se escribe en cuanto se termina y no
+    se acumula en memoria; sin ella se devuelven todas en empresas_totales.
+    Con `checkpoint` se saltan las paginas y fichas ya hechas y se guarda el
+    progreso tras cada ficha. Con `indice` (IndiceEmpresas) las fichas ya
+    vistas en ejecuciones anteriores no se vuelven a abrir, salvo con refrescar.
+    Con `metricas` (MetricasEjecucion) se mide el tiempo de cada etapa.
+    Con `fichas_http` las fichas se piden por HTTP (ver FICHAS_POR_HTTP).
+    Con `drivers` > 1 las fichas de cada pagina se reparten entre un pool de
+    navegadores que consumen una cola comun (ver DRIVERS_FICHAS). Con
+    `ligero` los navegadores van headless y sin recursos (ver NAVEGADOR_LIGERO).
+    """
     tipo, localidad = extraer_tipo_localidad_empresite(base_url)
     empresas_totales = []
-    vistas = set()
-
-    driver = crear_driver(use_profile=use_profile)
+    vistas = checkpoint.vistas if checkpoint else set()
+    if metricas is None:
+        metricas = MetricasEjecucion("empresite", base_url)
+    drivers = max(1, drivers)
+
+    # Estado compartido por los navegadores del pool
+    lock = threading.Lock()
+    estado = {"empresas": 0, "reutilizadas": 0, "sesion_fichas": None}
+    tareas = queue.Queue()
+    parar = threading.Event()
+    errores = []
+
+    def procesar_ficha(driver, detail_url, txt, title):
+        """Devuelve "reutilizada", "http", "navegador" o None si hay que parar."""
+        data = new_empresa(localidad_default=localidad)
+        data["url_detalle"] = detail_url
+
+        nombre = (txt or "").strip() or (title or "").strip()
+        if nombre and nombre.lower() != "ver ficha":
+            data["nombre"] = nombre
+        else:
+            data["nombre"] = nombre_desde_url_ficha(detail_url)
+
+        sesion_fichas = estado["sesion_fichas"]
+        previa = None
+        if indice is not None and not refrescar:
+            previa = indice.buscar([clave_url(detail_url)])
+        if previa is not None:
+            ficha, origen = previa, "reutilizada"
+        else:
+            ficha, origen = None, "navegador"
+            if sesion_fichas is not None:
+                ficha = descargar_ficha_http(sesion_fichas, detail_url, metricas)
+                if ficha is not None:
+                    origen = "http"
+                else:
+                    metricas.contar("fichas_navegador")
+            if ficha is None:
+                detail_html, ok_detail = esperar_y_obtener_html(
+                    driver, detail_url, log_func, metricas=metricas, etapa="ficha"
+                )
+                if not ok_detail:
+                    return None
+                with metricas.etapa("parseo"):
+                    ficha = extraer_datos_ficha_desde_html(detail_html)
+                if sesion_fichas is not None:
+                    # El navegador puede haber renovado la sesion o el consentimiento
+                    with lock:
+                        sesion_desde_driver(driver, sesion_fichas)
+        data["email"] = ficha["email"]
+        data["web"] = ficha["web"]
+        data["telefono"] = ficha["telefono"]
+
+        dominio = obtener_dominio_fiable(data)
+        if dominio:
+            data["email_posible_info"] = f"info@{dominio}"
+            data["email_posible_contacto"] = f"contacto@{dominio}"
+            data["email_posible_administracion"] = f"administracion@{dominio}"
+
+        clave = (data["nombre"], data["telefono"], data["web"], data["url_detalle"])
+        nueva = None
+        with metricas.etapa("escritura"):
+            with lock:
+                if clave not in vistas and datosvalidos(data):
+                    vistas.add(clave)
+                    nueva = clave
+                    estado["empresas"] += 1
+                    metricas.contar("empresas")
+                    if salida is not None:
+                        salida.escribir(data)
+                    else:
+                        empresas_totales.append(data)
+                # Bajo el mismo lock: el checkpoint recorre `vistas` al compactarse
+                if checkpoint:
+                    checkpoint.ficha_procesada(detail_url, nueva)
+            if previa is None and indice is not None:
+                indice.registrar(data, claves_empresa(data))
+        return origen
+
+    def trabajador(driver):
+        while True:
+            tarea = tareas.get()
+            try:
+                if tarea is None:
+                    return
+                if parar.is_set():
+                    continue
+                origen = procesar_ficha(driver, *tarea)
+                if origen is None:
+                    parar.set()
+                    continue
+                if origen == "reutilizada":
+                    # Sin peticion: ni pausa ni cuenta para el cooldown
+                    metricas.contar("reutilizadas")
+                    with lock:
+                        estado["reutilizadas"] += 1
+                    continue
+                metricas.contar("fichas")
+                if origen == "http":
+                    # Sin navegador no hay pausas de "humano": basta el limitador
+                    metricas.contar("fichas_http")
+            except Exception as exc:
+                errores.append(exc)
+                parar.set()
+            finally:
+                tareas.task_done()
+
+    pool = []
+    hilos = []
     try:
-        ocultar_navegador(driver)
-        detalles_ok = 0
+        with metricas.etapa("arranque_navegador"):
+            # Las copias del perfil se hacen antes de abrir ningun navegador:
+            # con Chrome ya usando el perfil principal se copiarian ficheros
+            # bloqueados o a medio escribir.
+            perfiles = [
+                directorio_perfil(n) if use_profile else CHROME_PROFILE_DIR
+                for n in range(drivers)
+            ]
+            for perfil in perfiles:
+                pool.append(crear_driver(use_profile=use_profile, perfil=perfil, ligero=ligero))
+        for driver in pool:
+            ocultar_navegador(driver)
+            # Pausas (ficha, pagina, cooldown) propias de cada navegador
+            driver.cortesia = crear_cortesia(metricas, log_func)
+        if drivers > 1:
+            log_func(f"Pool de {drivers} navegadores para las fichas.")
+        # El primero carga tambien los listados, mientras el pool esta parado
+        driver = pool[0]
+        for n, d in enumerate(pool):
+            hilo = threading.Thread(target=trabajador, args=(d,), name=f"ficha-{n}", daemon=True)
+            hilo.start()
+            hilos.append(hilo)
+
         for pagina in range(1, max_paginas + 1):
+            if checkpoint and pagina in checkpoint.paginas_completadas:
+                log_func(f"Pagina {pagina} ya completada, se salta.")
+                continue
             list_url = construir_url_empresite(base_url, pagina)
             log_func(f"Scrapeando pagina {pagina}: {list_url}")
-            html, ok = esperar_y_obtener_html(driver, list_url, log_func)
+            cargas_previas, cookies_previos = metricas.total("cookies")
+            html, ok = esperar_y_obtener_html(driver, list_url, log_func, metricas=metricas)
             if not ok:
                 break
 
-            soup = BeautifulSoup(html, "html.parser")
-            anchors = soup.select(
-                'a[onclick*="location.href"], a[href$=".html"], a[href*="/empresa/"], a[href*="/EMPRESA/"]'
-            )
+            with metricas.etapa("parseo"):
+                anchors, detail_urls = extraer_fichas_listado(html)
             if not anchors:
                 log_func("No se encontraron fichas en esta pagina.")
                 break
+            if fichas_http:
+                # Tras cada listado: el consentimiento puede llegar en una carga
+                # posterior a la primera (banner inyectado tarde)
+                with lock:
+                    estado["sesion_fichas"] = sesion_desde_driver(driver, estado["sesion_fichas"])
 
-            detail_urls = []
-            seen_page = set()
-            for a in anchors:
-                detail = extraer_url_ficha_empresite(a)
-                if detail and detail not in seen_page:
-                    seen_page.add(detail)
-                    detail_urls.append((detail, a.get_text(" ", strip=True), a.get("title", "")))
-
+            parar.clear()
             for detail_url, txt, title in detail_urls:
-                data = new_empresa(localidad_default=localidad)
-                data["url_detalle"] = detail_url
-
-                nombre = (txt or "").strip() or (title or "").strip()
-                if nombre and nombre.lower() != "ver ficha":
-                    data["nombre"] = nombre
-                else:
-                    data["nombre"] = nombre_desde_url_ficha(detail_url)
-
-                detail_html, ok_detail = esperar_y_obtener_html(driver, detail_url, log_func)
-                if not ok_detail:
-                    break
-                ficha = extraer_datos_ficha_desde_html(detail_html)
-                data["email"] = ficha["email"]
-                data["web"] = ficha["web"]
-                data["telefono"] = ficha["telefono"]
-
-                dominio = obtener_dominio_fiable(data)
-                if dominio:
-                    data["email_posible_info"] = f"info@{dominio}"
-                    data["email_posible_contacto"] = f"contacto@{dominio}"
-                    data["email_posible_administracion"] = f"administracion@{dominio}"
-
-                clave = (data["nombre"], data["telefono"], data["web"], data["url_detalle"])
-                if clave not in vistas and datosvalidos(data):
-                    vistas.add(clave)
-                    empresas_totales.append(data)
-
-                detalles_ok += 1
-                time.sleep(random.uniform(*DETAIL_DELAY_SECONDS))
-                if detalles_ok % COOLDOWN_EVERY_N_DETAILS == 0:
-                    cooldown = random.uniform(*COOLDOWN_SECONDS)
-                    log_func(f"Cooldown anti-bloqueo: esperando {cooldown:.0f}s tras {detalles_ok} fichas.")
-                    time.sleep(cooldown)
-
-            log_func(f"Pagina {pagina} procesada ({len(empresas_totales)} empresas acumuladas)")
-            time.sleep(random.uniform(*PAGE_DELAY_SECONDS))
+                if checkpoint and detail_url in checkpoint.urls_detalle:
+                    continue
+                tareas.put((detail_url, txt, title))
+            tareas.join()
+            if errores:
+                raise errores[0]
+            pagina_ok = not parar.is_set()
+
+            if checkpoint and pagina_ok:
+                checkpoint.pagina_completada(pagina)
+            metricas.contar("paginas")
+            log_func(f"Pagina {pagina} procesada ({estado['empresas']} empresas acumuladas)")
+            cargas, cookies_seg = metricas.total("cookies")
+            cargas, cookies_seg = cargas - cargas_previas, cookies_seg - cookies_previos
+            if cargas:
+                ahorro = cargas * COOKIES_COSTE_ANTERIOR_SECONDS - cookies_seg
+                log_func(
+                    f"Cookies: {cookies_seg:.1f}s en {cargas} cargas "
+                    f"(hasta {ahorro:.0f}s menos que comprobando etiqueta a etiqueta)."
+                )
+            if estado["reutilizadas"]:
+                log_func(f"{estado['reutilizadas']} fichas ya vistas reutilizadas sin abrirlas.")
+                estado["reutilizadas"] = 0
+            # Pausa entre paginas: se cumple antes de cargar el siguiente listado
+            driver.cortesia.programar("pagina")
     finally:
-        driver.quit()
-
+        parar.set()
+        for _ in hilos:
+            tareas.put(None)
+        for hilo in hilos:
+            hilo.join()
+        if estado["sesion_fichas"] is not None:
+            estado["sesion_fichas"].close()
+        for d in pool:
+            d.quit()
+
+    if estado["sesion_fichas"] is not None:
+        contadores = metricas.resumen()["contadores"]
+        log_func(
+            f"Fichas por HTTP: {contadores.get('fichas_http', 0)}, "
+            f"en navegador: {contadores.get('fichas_navegador', 0)}."
+        )
     return tipo, localidad, empresas_totales
 
 
-def guardar_resultado(base_url, tipo, localidad, empresas_totales, log_func):
-    resultado_final = {
-        "localidad": localidad,
-        "tipo_empresa": tipo,
-        "resultados": empresas_totales,
-    }
+def guardar_resultado_desde_jsonl(base_url, ruta_jsonl, log_func):
     output = OUTPUT_DIR / generar_nombre_archivo(base_url)
-    with open(output, "w", encoding="utf-8") as f:
-        json.dump(resultado_final, f, ensure_ascii=False, indent=4)
-    log_func(f"Scraping finalizado. Total empresas: {len(empresas_totales)}")
-    log_func(f"Guardado en: {output}")
+    output, total = convertir_a_json(ruta_jsonl, output)
+    log_func(f"Scraping finalizado. Total empresas: {total}")
+    log_func(f"Guardado en: {output} (streaming en {ruta_jsonl})")
+
 
+def guardar_metricas(base_url, metricas, log_func):
+    ruta = OUTPUT_DIR / generar_nombre_archivo(base_url).replace(".json", "_metricas.json")
+    metricas.guardar_json(ruta)
+    metricas.guardar_prometheus(ruta.with_suffix(".prom"))
+    metricas.log(log_func, prefijo="Tiempos por etapa en ")
 
-def iniciar_scraping(base_url, max_paginas, log_func, use_profile=True):
+
+def iniciar_scraping(base_url, max_paginas, log_func, use_profile=True, reanudar=False,
+                     refrescar=False, fichas_http=FICHAS_POR_HTTP, drivers=DRIVERS_FICHAS,
+                     ligero=NAVEGADOR_LIGERO):
+    """
+    Devuelve {"paginas", "empresas", "metricas"} de esta ejecucion; los tiempos
+    por etapa se guardan tambien en <busqueda>_metricas.json y .prom. Con
+    refrescar se vuelven a abrir las fichas ya vistas en otras ejecuciones.
+    Con fichas_http se usa el modo hibrido (ver FICHAS_POR_HTTP) y con
+    drivers > 1 un pool de navegadores para las fichas (ver DRIVERS_FICHAS).
+    Con ligero, navegadores headless sin imagenes ni CSS (ver NAVEGADOR_LIGERO).
+    """
     dominio = obtener_dominio(base_url) or ""
-    if "empresite.eleconomista.es" not in dominio:
-        log_func("Este scraper es exclusivo para empresite.eleconomista.es")
-        return
-    tipo, localidad, empresas_totales = iniciar_scraping_empresite(
-        base_url, max_paginas, log_func, use_profile=use_profile
+    if HOST_EMPRESITE not in dominio:
+        log_func(f"Este scraper es exclusivo para {HOST_EMPRESITE}")
+        return {"paginas": 0, "empresas": 0}
+    tipo, localidad = extraer_tipo_localidad_empresite(base_url)
+    checkpoint = Checkpoint.abrir(generar_nombre_archivo(base_url), reanudar=reanudar)
+    if checkpoint.reanudado:
+        log_func(
+            f"Reanudando: {len(checkpoint.paginas_completadas)} paginas y "
+            f"{len(checkpoint.urls_detalle)} fichas ya hechas."
+        )
+    paginas_previas = len(checkpoint.paginas_completadas)
+    ruta_jsonl = OUTPUT_DIR / generar_nombre_archivo(base_url).replace(".json", ".jsonl")
+    salida = SalidaJSONL(
+        ruta_jsonl, localidad, tipo, comprimir=COMPRIMIR_SALIDA, reiniciar=not reanudar
     )
-    guardar_resultado(base_url, tipo, localidad, empresas_totales, log_func)
+    metricas = MetricasEjecucion("empresite", base_url)
+    try:
+        iniciar_scraping_empresite(
+            base_url, max_paginas, log_func, use_profile=use_profile, salida=salida,
+            checkpoint=checkpoint, indice=indice_global(), refrescar=refrescar,
+            metricas=metricas, fichas_http=fichas_http, drivers=drivers, ligero=ligero,
+        )
+    finally:
+        salida.cerrar()
+        guardar_metricas(base_url, metricas.terminar(), log_func)
+    guardar_resultado_desde_jsonl(base_url, salida.ruta, log_func)
+    return {
+        "paginas": len(checkpoint.paginas_completadas) - paginas_previas,
+        "empresas": salida.total,
+        "metricas": metricas.resumen(),
+    }
 
 
 def lanzar_gui():
+    import tkinter as tk
+    from tkinter import messagebox, ttk
+
     log_queue = queue.Queue()
     running = {"value": False}
 
@@ -520,10 +1030,14 @@ def lanzar_gui():
         running["value"] = is_running
         btn_scrap.config(state=("disabled" if is_running else "normal"))
 
-    def worker(url, paginas, solo_email, use_profile):
+    def worker(url, paginas, solo_email, use_profile, reanudar, refrescar, fichas_http, drivers,
+               ligero):
         try:
             url_filtrada = aplicar_filtros_empresite(url, solo_email)
-            iniciar_scraping(url_filtrada, paginas, log, use_profile=use_profile)
+            iniciar_scraping(
+                url_filtrada, paginas, log, use_profile=use_profile, reanudar=reanudar,
+                refrescar=refrescar, fichas_http=fichas_http, drivers=drivers, ligero=ligero,
+            )
             root.after(0, lambda: messagebox.showinfo("Finalizado", "Scraping completado"))
         except Exception as exc:
             err_msg = str(exc)
@@ -540,10 +1054,25 @@ def lanzar_gui():
         except ValueError:
             messagebox.showerror("Error", "Numero de paginas invalido")
             return
+        try:
+            drivers = max(1, int(entry_drivers.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Numero de navegadores invalido")
+            return
         set_running_state(True)
         threading.Thread(
             target=worker,
-            args=(entry_url.get().strip(), paginas, var_solo_email.get(), var_use_profile.get()),
+            args=(
+                entry_url.get().strip(),
+                paginas,
+                var_solo_email.get(),
+                var_use_profile.get(),
+                var_reanudar.get(),
+                var_refrescar.get(),
+                var_fichas_http.get(),
+                drivers,
+                var_ligero.get(),
+            ),
             daemon=True,
         ).start()
         root.after(120, flush_logs)
@@ -565,6 +1094,11 @@ def lanzar_gui():
     entry_paginas.insert(0, "3")
     entry_paginas.pack(fill="x")
 
+    ttk.Label(frame, text="Navegadores para fichas:").pack(anchor="w")
+    entry_drivers = ttk.Entry(frame)
+    entry_drivers.insert(0, str(DRIVERS_FICHAS))
+    entry_drivers.pack(fill="x")
+
     var_solo_email = tk.BooleanVar(value=True)
     ttk.Checkbutton(
         frame,
@@ -579,6 +1113,34 @@ def lanzar_gui():
         variable=var_use_profile,
     ).pack(anchor="w")
 
+    var_reanudar = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        frame,
+        text="Reanudar busqueda interrumpida (checkpoint)",
+        variable=var_reanudar,
+    ).pack(anchor="w")
+
+    var_refrescar = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        frame,
+        text="Refrescar fichas ya vistas en otras busquedas",
+        variable=var_refrescar,
+    ).pack(anchor="w")
+
+    var_fichas_http = tk.BooleanVar(value=FICHAS_POR_HTTP)
+    ttk.Checkbutton(
+        frame,
+        text="Fichas por HTTP con la sesion del navegador (mas rapido)",
+        variable=var_fichas_http,
+    ).pack(anchor="w")
+
+    var_ligero = tk.BooleanVar(value=NAVEGADOR_LIGERO)
+    ttk.Checkbutton(
+        frame,
+        text="Navegador ligero (oculto, sin imagenes ni CSS)",
+        variable=var_ligero,
+    ).pack(anchor="w")
+
     btn_scrap = ttk.Button(frame, text="Iniciar scraping", command=ejecutar)
     btn_scrap.pack(pady=10)
 
@@ -1,10 +1,11 @@
 import requests
-from bs4 import BeautifulSoup
 import time
 import random
 import re
 import json
 
+from parser_html import crear_soup
+
 # ----------- CONFIGURACIÓN -----------
 BASE_URL = "https://www.paginasamarillas.es/search/asesorias-y-gestorias/all-ma/madrid/all-is/all-ci/all-ba/all-pu/all-nc/{}?co=Asesorias+y+gestorias&what=Asesorias+y+gestorias&ub=false&qc=true"
 
@@ -29,7 +30,7 @@ while True:
         print(f"No se pudo acceder a la página {pagina}. Código: {response.status_code}")
         break
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = crear_soup(response.text)
     empresas_html = soup.find_all("div", class_="box")
 
     # Si no hay empresas, finalizamos
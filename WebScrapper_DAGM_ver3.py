@@ -1,10 +1,11 @@
 import requests
-from bs4 import BeautifulSoup
 import time
 import random
 import re
 import json
 
+from parser_html import crear_soup
+
 # =======================
 # CONFIGURACIÓN
 # =======================
@@ -24,7 +25,7 @@ N8N_WEBHOOK_URL = "https://danmelendo.app.n8n.cloud/webhook-test/4f3a83ba-d9e4-4
 response = requests.get(URL, headers=HEADERS, timeout=15)
 response.raise_for_status()
 
-soup = BeautifulSoup(response.text, "html.parser")
+soup = crear_soup(response.text)
 empresas_html = soup.find_all("div", class_="box")
 print(f"Empresas encontradas: {len(empresas_html)}")
 
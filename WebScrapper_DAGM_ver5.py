@@ -1,5 +1,4 @@
 import requests
-from bs4 import BeautifulSoup
 import time
 import random
 import re
@@ -10,6 +9,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import unicodedata
 
+from enriquecimiento_async import enriquecer_emails
+from parser_html import crear_soup
+
 # ---------------- CONFIGURACIÓN ----------------
 
 BASE_URL = (
@@ -181,7 +183,7 @@ def iniciar_scraping(base_url, max_paginas, scrapear_email_web, log_func):
             log_func(f"❌ Error HTTP {response.status_code}")
             break
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = crear_soup(response.text)
         empresas_html = soup.find_all("div", class_="box")
 
         if not empresas_html:
@@ -239,20 +241,6 @@ def iniciar_scraping(base_url, max_paginas, scrapear_email_web, log_func):
             if web_tag:
                 data["web"] = web_tag["href"].split("?")[0].strip()
 
-            # Email desde web externa
-            if scrapear_email_web and data["email"] == "No disponible" and data["web"] != "No disponible":
-                email_web = obtener_email_web(data["web"])
-                if email_web:
-                    data["email"] = email_web
-
-            # Emails posibles
-            if data["email"] == "No disponible":
-                dominio = obtener_dominio_fiable(data)
-            if dominio:
-                 data["email_posible_info"] = f"info@{dominio}"
-                 data["email_posible_contacto"] = f"contacto@{dominio}"
-                 data["email_posible_administracion"] = f"administracion@{dominio}"
-                
             # Dirección
             tag = empresa.select_one("span[itemprop='streetAddress']")
             if tag:
@@ -271,6 +259,18 @@ def iniciar_scraping(base_url, max_paginas, scrapear_email_web, log_func):
             else:
                 log_func("⏭️ Empresa descartada (sin datos útiles)")
 
+        # Email desde web externa (todas las webs de la página a la vez)
+        if scrapear_email_web:
+            enriquecer_emails(empresas, obtener_email_web, log_func=log_func)
+
+        # Emails posibles
+        for data in empresas:
+            if data["email"] == "No disponible":
+                dominio = obtener_dominio_fiable(data)
+            if dominio:
+                 data["email_posible_info"] = f"info@{dominio}"
+                 data["email_posible_contacto"] = f"contacto@{dominio}"
+                 data["email_posible_administracion"] = f"administracion@{dominio}"
 
         tipo_empresa, localidad = extraer_info_url(base_url)
 
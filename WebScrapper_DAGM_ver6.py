@@ -1,15 +1,23 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-import random
+import os
 import re
 import json
+from contextlib import closing
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
-import tkinter as tk
-from tkinter import ttk, messagebox
 import unicodedata
 
+import sesion_http
+from checkpoint import Checkpoint
+from escaner import buscar_telefono, primer_email_dominio
+from indice_empresas import claves_empresa, indice_global
+from memo_dominios import memo_global
+from metricas import MetricasEjecucion
+from paginacion import PlanPaginas
+from paginas_contacto import CONTACTO_CONFIG, PaginasContacto, enlaces_contacto
+from parser_html import iterar_elementos, parsear
+from prefetch_paginas import paginas_prefetch
+from salida_jsonl import SalidaJSONL
+
 # ---------------- CONFIGURACIÓN ----------------
 
 HEADERS = {
@@ -17,11 +25,28 @@ HEADERS = {
     "Accept-Language": "es-ES,es;q=0.9"
 }
 
+# Host del directorio: sus enlaces ("Cómo llegar", ficha) no son la web de la empresa.
+# SCRAPER_HOST_PA permite apuntar el scraper a un servidor local de pruebas.
+HOST_DIRECTORIO = os.getenv("SCRAPER_HOST_PA", "paginasamarillas")
+
 OUTPUT_DIR = Path("resultados")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 telefono_regex = re.compile(r"(\+34\s?\d{9}|\b\d{9}\b)")
 email_regex = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+web_clase_regex = re.compile("web|website", re.I)
+# Número de página en la ruta: /all-nc/2 (URLs reales) o /all-nc/"2" (forma antigua)
+pagina_url_regex = re.compile(r'(/all-nc/(?:"|%22)?)\d+((?:"|%22)?)')
+_CARACTERES_EMAIL = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.+-@"
+
+PAGINAS_ADELANTADAS = 2  # páginas de listado que se descargan por delante (0 = en serie)
+SALIDA_JSONL = "jsonl"   # "jsonl", "jsonl.gz" o None: empresas en streaming a <busqueda>.jsonl
+
+# Búsqueda de email en la web de la empresa: se lee en streaming y se corta
+# al encontrar un email del dominio o al llegar al tope de bytes.
+EMAIL_WEB_MAX_BYTES = 512 * 1024
+EMAIL_WEB_TROZO = 16 * 1024
+EMAIL_WEB_TIPOS = ("text/html", "application/xhtml+xml", "text/plain")
 
 # ---------------- FUNCIONES AUXILIARES ----------------
 
@@ -45,25 +70,127 @@ def obtener_dominio(url):
     except:
         return None
 
-def obtener_email_web(url):
-    """Extrae email SOLO si coincide con el dominio de la web"""
+def obtener_email_web(url, diferir_contacto=False):
+    """
+    Extrae email SOLO si coincide con el dominio de la web. Si la portada no
+    lo tiene, mira las páginas del dominio con más pinta de contacto
+    (contacto, aviso legal...) dentro del plazo de CONTACTO_CONFIG.
+    Con diferir_contacto no las mira: devuelve un PaginasContacto para que el
+    enriquecimiento las descargue en paralelo dentro de sus cupos.
+    El resultado (también el negativo) se memoriza por dominio entre ejecuciones.
+    """
     try:
         dominio = obtener_dominio(url)
         if not dominio:
             return None
 
-        r = requests.get(url, headers=HEADERS, timeout=10)
-        if r.status_code != 200:
+        memo = memo_global()
+        encontrado, email = memo.consultar(dominio)
+        if encontrado:
+            return email
+
+        estado, email, html, url_final = _email_de_pagina(url, dominio, 10, guardar_html=True)
+        if estado != 200:
+            # Los 4xx no se arreglan solos; los 5xx se reintentan otro día
+            if 400 <= estado < 500:
+                memo.guardar(dominio, None)
             return None
 
-        for email in email_regex.findall(r.text):
-            email = limpiar_email(email)
-            if dominio in email:
-                return email
-        return None
+        if email is None:
+            # Los enlaces relativos se resuelven contra la URL tras las redirecciones
+            enlaces = enlaces_contacto(html, url_final, dominio)
+            if enlaces:
+                paginas = PaginasContacto(
+                    enlaces,
+                    lambda enlace, plazo: _email_de_contacto(enlace, dominio, min(10, plazo)),
+                    CONTACTO_CONFIG["plazo"],
+                    lambda email, completo: _memorizar_email(dominio, email, completo),
+                )
+                return paginas if diferir_contacto else paginas.resolver()
+
+        memo.guardar(dominio, email)
+        return email
     except:
         return None
 
+def _memorizar_email(dominio, email, completo):
+    """Cierre de las páginas de contacto de obtener_email_web."""
+    if email is None and not completo:
+        # Plazo agotado o páginas que fallaron: no se da el dominio por mirado
+        return None
+    try:
+        memo_global().guardar(dominio, email)
+    except Exception:
+        pass
+    return email
+
+def _email_de_pagina(url, dominio, timeout, guardar_html=False):
+    """
+    (estado, email, html, url_final) de una página. El email sale del
+    escaneo en streaming; html son los bytes leídos (solo con guardar_html,
+    para buscar enlaces) o None si la respuesta no es texto; url_final es la
+    URL tras las redirecciones (http -> https, / -> /es/...).
+    """
+    r = sesion_http.get(url, headers=HEADERS, timeout=timeout, stream=True)
+    try:
+        if r.status_code != 200:
+            return r.status_code, None, None, r.url
+        if not es_tipo_texto(r.headers.get("Content-Type")):
+            # PDF, imagen...: ni se descarga
+            return r.status_code, None, None, r.url
+
+        leido = []
+        trozos = r.iter_content(EMAIL_WEB_TROZO)
+        if guardar_html:
+            trozos = _copiando(trozos, leido)
+        email = _buscar_email_stream(trozos, dominio)
+        return r.status_code, email, b"".join(leido), r.url
+    finally:
+        r.close()
+
+def _email_de_contacto(url, dominio, timeout):
+    estado, email, _, _ = _email_de_pagina(url, dominio, timeout)
+    if estado >= 500:
+        # Como en la portada: un fallo del servidor no cuenta como página mirada
+        raise RuntimeError(f"HTTP {estado} en {url}")
+    return email
+
+def _copiando(trozos, destino):
+    for trozo in trozos:
+        destino.append(trozo)
+        yield trozo
+
+def es_tipo_texto(content_type):
+    if not content_type:
+        return True
+    tipo = content_type.split(";")[0].strip().lower()
+    return tipo in EMAIL_WEB_TIPOS
+
+def _buscar_email_stream(trozos, dominio, max_bytes=EMAIL_WEB_MAX_BYTES):
+    """
+    Busca sobre los bytes según llegan y para en cuanto hay un email del
+    dominio o se han leído max_bytes. Mismos resultados que email_regex
+    sobre el texto completo (el patrón solo admite ASCII).
+    """
+    leidos = 0
+    resto = b""
+    for trozo in trozos:
+        leidos += len(trozo)
+        bloque = resto + trozo
+        # Un email puede quedar partido entre trozos: lo que hay tras el último
+        # carácter que no puede formar parte de uno pasa al siguiente trozo
+        completo = bloque.rstrip(_CARACTERES_EMAIL)
+        email = _buscar_email_dominio(completo, dominio)
+        if email:
+            return email
+        resto = bloque[len(completo):]
+        if leidos >= max_bytes:
+            return None
+    return _buscar_email_dominio(resto, dominio)
+
+def _buscar_email_dominio(datos, dominio):
+    return primer_email_dominio(datos, dominio, limpiar_email)
+
 def obtener_dominio_fiable(data):
     if data["web"] != "No disponible":
         dominio = obtener_dominio(data["web"])
@@ -87,13 +214,17 @@ def datosvalidos(data):
 
 def construir_url(base_url, pagina):
     """
-    Construye la URL reemplazando el número entre comillas después de /all-nc/"
+    Construye la URL de la página reemplazando el número tras /all-nc/.
+    Acepta la forma real (/all-nc/2?what=...) y la antigua entre comillas
+    (/all-nc/"2", también como %22).
     """
     def reemplazo(match):
         return f'{match.group(1)}{pagina}{match.group(2)}'
 
-    nueva_url = re.sub(r'(/all-nc/")\d+(")', reemplazo, base_url)
-    return nueva_url
+    return pagina_url_regex.sub(reemplazo, base_url, count=1)
+
+def url_paginable(base_url):
+    return pagina_url_regex.search(base_url) is not None
     
 def extraer_info_url(url):
     try:
@@ -119,128 +250,319 @@ def generar_nombre_archivo(base_url):
 
 # ---------------- SCRAPING ----------------
 
-def iniciar_scraping(base_url, max_paginas, scrapear_email_web, log_func):
+_CAMPOS_ITEMPROP = {
+    "name": "nombre",
+    "streetAddress": "direccion",
+    "postalCode": "codigo_postal",
+    "addressLocality": "localidad",
+}
+
+def extraer_datos_tarjeta(empresa):
+    """
+    Extrae los datos de una tarjeta div.box del listado (sin enriquecer)
+    recorriendo su subárbol una sola vez.
+    """
+    data = {
+        "nombre": "No disponible",
+        "telefono": "No disponible",
+        "email": "No disponible",
+        "email_posible_info": "No disponible",
+        "email_posible_contacto": "No disponible",
+        "email_posible_administracion": "No disponible",
+        "web": "No disponible",
+        "direccion": "No disponible",
+        "codigo_postal": "No disponible",
+        "localidad": "No disponible"
+    }
+
+    spans = {}
+    tel_tag = email_tag = web_tag = web_fallback = None
+
+    for nombre, attrs, tag in iterar_elementos(empresa):
+        if nombre == "span":
+            campo = _CAMPOS_ITEMPROP.get(attrs.get("itemprop"))
+            if campo and campo not in spans:
+                spans[campo] = tag
+        elif nombre == "a":
+            href = attrs.get("href")
+            if href:
+                if tel_tag is None and href.startswith("tel:"):
+                    tel_tag = tag
+                elif email_tag is None and href.startswith("mailto:"):
+                    email_tag = tag
+                elif (web_fallback is None and href.startswith("http")
+                      and HOST_DIRECTORIO not in href):
+                    web_fallback = tag
+
+            clase = attrs.get("class")
+            if web_tag is None and clase is not None:
+                if not isinstance(clase, str):
+                    clase = " ".join(clase)
+                if web_clase_regex.search(clase):
+                    web_tag = tag
+        else:
+            continue
+
+        if (web_tag is not None and tel_tag is not None and email_tag is not None
+                and len(spans) == len(_CAMPOS_ITEMPROP)):
+            break
+
+    # ---------------- NOMBRE Y DIRECCIÓN ----------------
+    for campo, tag in spans.items():
+        data[campo] = tag.get_text(strip=True)
+
+    # ---------------- TELÉFONO (HIBRIDO) ----------------
+    if tel_tag is not None:
+        data["telefono"] = normalizar_telefono(
+            tel_tag["href"].replace("tel:", "")
+        )
+    else:
+        texto = empresa.get_text(" ", strip=True)
+        telefono = buscar_telefono(texto)
+        if telefono:
+            data["telefono"] = normalizar_telefono(telefono)
+
+    # ---------------- EMAIL DIRECTO ----------------
+    if email_tag is not None:
+        data["email"] = limpiar_email(
+            email_tag["href"].replace("mailto:", "")
+        )
+
+    # ---------------- WEB / MÁS INFO (ROBUSTO) ----------------
+    if web_tag is None:
+        web_tag = web_fallback
+
+    if web_tag is not None:
+        data["web"] = (web_tag.get("href") or "").split("?")[0]
+
+    return data
+
+def extraer_tarjetas(html, backend=None):
+    soup = parsear(html, backend)
+    return [extraer_datos_tarjeta(empresa) for empresa in soup.select("div.box")]
+
+def descargar_pagina(url):
+    return sesion_http.get(url, headers=HEADERS, timeout=15)
+
+def abrir_salida_jsonl(base_url, formato, reiniciar=True):
+    """formato: "jsonl", "jsonl.gz" o None (sin salida en streaming)."""
+    if not formato:
+        return None
+    tipo, localidad = extraer_info_url(base_url)
+    ruta = OUTPUT_DIR / generar_nombre_archivo(base_url).replace(".json", ".jsonl")
+    return SalidaJSONL(ruta, localidad, tipo, comprimir=formato.endswith(".gz"), reiniciar=reiniciar)
+
+def iniciar_scraping(base_url, max_paginas, scrapear_email_web, log_func,
+                     paginas_adelantadas=PAGINAS_ADELANTADAS, salida_jsonl=SALIDA_JSONL,
+                     reanudar=False, estadisticas=True, refrescar=False):
+    """
+    Devuelve {"paginas", "empresas", "metricas"} de esta ejecución; los
+    tiempos por etapa se guardan también en <busqueda>_metricas.json y .prom.
+    Con estadisticas=False no reinicia ni muestra los contadores de la capa
+    HTTP (útil cuando varias búsquedas comparten proceso). Las empresas ya
+    vistas en ejecuciones anteriores reutilizan sus datos sin consultar su
+    web, salvo con refrescar=True.
+    """
+    if estadisticas:
+        sesion_http.reiniciar_estadisticas()
+    metricas = MetricasEjecucion("ver6", base_url)
+
+    def descargar(url):
+        with metricas.etapa("descarga"):
+            return descargar_pagina(url)
+
+    checkpoint = Checkpoint.abrir(generar_nombre_archivo(base_url), reanudar=reanudar)
+    if checkpoint.reanudado:
+        log_func(f"⏩ Reanudando: {len(checkpoint.paginas_completadas)} páginas ya completadas")
+
+    plan = PlanPaginas(max_paginas)
+    if max_paginas > 1 and not url_paginable(base_url):
+        log_func("⚠️ La URL no tiene /all-nc/N: solo se scrapea la página 1")
+        plan.limite = 1
+    if 1 in checkpoint.paginas_completadas:
+        # La página 1 no se vuelve a leer: límite y huellas salen del checkpoint
+        plan.restaurar(checkpoint.paginas_anunciadas, checkpoint.huellas)
+
+    salida = abrir_salida_jsonl(base_url, salida_jsonl, reiniciar=not reanudar)
+    try:
+        paginas = _paginas_pendientes(base_url, plan, checkpoint)
+        with closing(paginas_prefetch(paginas, descargar, paginas_adelantadas)) as descargas:
+            paginas, empresas = _procesar_paginas(
+                base_url, _medir_espera(descargas, metricas), scrapear_email_web, log_func,
+                salida, checkpoint, plan, indice_global(), refrescar, metricas,
+            )
+    finally:
+        # Si la página 1 no llegó a leerse, el prefetch (ya parado) deja de esperarla
+        plan.dar_por_leida()
+        if salida:
+            salida.cerrar()
+            log_func(f"📝 {salida.total} empresas en {salida.ruta}")
+
+    if estadisticas:
+        sesion_http.log_estadisticas(log_func)
+    guardar_metricas(base_url, metricas.terminar(), log_func)
+    log_func("🎉 Scraping finalizado")
+    return {"paginas": paginas, "empresas": empresas, "metricas": metricas.resumen()}
+
+def guardar_metricas(base_url, metricas, log_func):
+    ruta = OUTPUT_DIR / generar_nombre_archivo(base_url).replace(".json", "_metricas.json")
+    metricas.guardar_json(ruta)
+    metricas.guardar_prometheus(ruta.with_suffix(".prom"))
+    metricas.log(log_func)
+
+def _medir_espera(descargas, metricas):
+    """Tiempo que el bucle principal pasa esperando a que el prefetch entregue página."""
+    while True:
+        with metricas.etapa("espera_descarga"):
+            item = next(descargas, None)
+        if item is None:
+            return
+        yield item
+
+def _paginas_pendientes(base_url, plan, checkpoint):
+    """
+    (pagina, url) a descargar. Se evalúa de forma perezosa desde el hilo de
+    prefetch, que no pasa de la página 1 hasta que se ha leído: así ninguna
+    página más allá del límite que anuncia llega a pedirse.
+    """
+    for pagina in range(1, plan.max_paginas + 1):
+        if pagina > 1:
+            plan.esperar_primera()
+        if not plan.pendiente(pagina):
+            return
+        if pagina not in checkpoint.paginas_completadas:
+            yield pagina, construir_url(base_url, pagina)
+
+def _procesar_paginas(base_url, descargas, scrapear_email_web, log_func, salida=None,
+                      checkpoint=None, plan=None, indice=None, refrescar=False, metricas=None):
+    if metricas is None:
+        metricas = MetricasEjecucion("ver6", base_url)
+    paginas_ok = 0
+    total_empresas = 0
+
+    for pagina, url, r in descargas:
+        # Páginas ya descargadas por el prefetch antes de conocer el límite
+        if plan and not plan.pendiente(pagina):
+            break
 
-    for pagina in range(1, max_paginas + 1):
-        url = construir_url(base_url, pagina)
         log_func(f"📄 Scrapeando página {pagina}")
 
-        r = requests.get(url, headers=HEADERS, timeout=15)
+        if isinstance(r, Exception):
+            raise r
         if r.status_code != 200:
             log_func(f"❌ Error HTTP {r.status_code}")
             break
 
-        soup = BeautifulSoup(r.text, "html.parser")
-        empresas_html = soup.find_all("div", class_="box")
+        with metricas.etapa("parseo"):
+            soup = parsear(r.text)
+            empresas_html = soup.select("div.box")
+
+            empresas = []
+
+            for empresa in empresas_html:
+                data = extraer_datos_tarjeta(empresa)
+
+                if datosvalidos(data):
+                    empresas.append(data)
 
         if not empresas_html:
             log_func("⚠️ No hay más empresas")
             break
 
-        empresas = []
-
-        for empresa in empresas_html:
-            time.sleep(random.uniform(0.3, 0.7))
-
-            data = {
-                "nombre": "No disponible",
-                "telefono": "No disponible",
-                "email": "No disponible",
-                "email_posible_info": "No disponible",
-                "email_posible_contacto": "No disponible",
-                "email_posible_administracion": "No disponible",
-                "web": "No disponible",
-                "direccion": "No disponible",
-                "codigo_postal": "No disponible",
-                "localidad": "No disponible"
-            }
-
-            # ---------------- NOMBRE ----------------
-            tag = empresa.select_one("span[itemprop='name']")
-            if tag:
-                data["nombre"] = tag.get_text(strip=True)
-
-            # ---------------- TELÉFONO (HIBRIDO) ----------------
-            tel_tag = empresa.find("a", href=re.compile(r"^tel:"))
-            if tel_tag:
-                data["telefono"] = normalizar_telefono(
-                    tel_tag["href"].replace("tel:", "")
+        if plan and pagina == 1:
+            anunciadas = plan.leer_primera(r.text, len(empresas_html))
+            if anunciadas is not None:
+                log_func(f"🧭 El directorio anuncia {anunciadas} páginas: se scrapean {plan.limite}")
+                if checkpoint:
+                    checkpoint.fijar_paginas_anunciadas(anunciadas)
+
+        # Mismas tarjetas que una página anterior: la paginación no avanza
+        huella = PlanPaginas.huella(empresas)
+        if plan:
+            anterior = plan.repetida(pagina, empresas)
+            if anterior is not None:
+                log_func(f"⚠️ La página {pagina} repite la página {anterior}: fin del listado")
+                break
+
+        # ---------------- EMPRESAS YA VISTAS ----------------
+        nuevas = empresas
+        if indice is not None:
+            nuevas = []
+            with metricas.etapa("indice"):
+                for data in empresas:
+                    previa = None if refrescar else indice.buscar(claves_empresa(data))
+                    if previa is None:
+                        nuevas.append(data)
+                    elif data["email"] == "No disponible":
+                        data["email"] = previa.get("email", "No disponible")
+            metricas.contar("reutilizadas", len(empresas) - len(nuevas))
+            if len(nuevas) < len(empresas):
+                log_func(f"♻️ {len(empresas) - len(nuevas)} empresas ya vistas: se reutilizan sus datos")
+
+        # ---------------- EMAIL DESDE WEB (LOTE CONCURRENTE) ----------------
+        if scrapear_email_web and nuevas:
+            # asyncio solo se carga si de verdad se enriquece
+            from enriquecimiento_async import enriquecer_emails
+
+            with metricas.etapa("enriquecimiento"):
+                encontrados = enriquecer_emails(
+                    nuevas, lambda url: obtener_email_web(url, diferir_contacto=True),
+                    log_func=log_func,
                 )
-            else:
-                texto = empresa.get_text(" ", strip=True)
-                match = telefono_regex.search(texto)
-                if match:
-                    data["telefono"] = normalizar_telefono(match.group())
-
-            # ---------------- EMAIL DIRECTO ----------------
-            email_tag = empresa.find("a", href=re.compile(r"^mailto:"))
-            if email_tag:
-                data["email"] = limpiar_email(
-                    email_tag["href"].replace("mailto:", "")
-                )
-
-            # ---------------- WEB / MÁS INFO (ROBUSTO) ----------------
-            web_tag = empresa.find("a", class_=re.compile("web|website", re.I))
-            if not web_tag:
-                for a in empresa.find_all("a", href=True):
-                    href = a["href"]
-                    if href.startswith("http") and "paginasamarillas" not in href:
-                        web_tag = a
-                        break
-
-            if web_tag:
-                data["web"] = web_tag["href"].split("?")[0]
-
-            # ---------------- EMAIL DESDE WEB ----------------
-            if scrapear_email_web and data["email"] == "No disponible" and data["web"] != "No disponible":
-                email_web = obtener_email_web(data["web"])
-                if email_web:
-                    data["email"] = email_web
+            metricas.contar("emails_web", encontrados)
+            if encontrados:
+                log_func(f"📧 {encontrados} emails encontrados en webs externas")
 
+        with metricas.etapa("escritura"):
             # ---------------- EMAILS POSIBLES ----------------
-            dominio = obtener_dominio_fiable(data)
-            if dominio:
-                data["email_posible_info"] = f"info@{dominio}"
-                data["email_posible_contacto"] = f"contacto@{dominio}"
-                data["email_posible_administracion"] = f"administracion@{dominio}"
-
-            # ---------------- DIRECCIÓN ----------------
-            tag = empresa.select_one("span[itemprop='streetAddress']")
-            if tag:
-                data["direccion"] = tag.get_text(strip=True)
-
-            tag = empresa.select_one("span[itemprop='postalCode']")
-            if tag:
-                data["codigo_postal"] = tag.get_text(strip=True)
-
-            tag = empresa.select_one("span[itemprop='addressLocality']")
-            if tag:
-                data["localidad"] = tag.get_text(strip=True)
-
-            if datosvalidos(data):
-                empresas.append(data)
+            for data in empresas:
+                dominio = obtener_dominio_fiable(data)
+                if dominio:
+                    data["email_posible_info"] = f"info@{dominio}"
+                    data["email_posible_contacto"] = f"contacto@{dominio}"
+                    data["email_posible_administracion"] = f"administracion@{dominio}"
+
+                if salida:
+                    salida.escribir(data)
+
+            # Solo las que ya no tienen nada que buscar en su web; el resto queda
+            # en manos del memo de dominios y de sus TTL
+            if indice is not None:
+                for data in nuevas:
+                    if data["email"] != "No disponible" or data["web"] == "No disponible":
+                        indice.registrar(data)
+
+            tipo, localidad = extraer_info_url(base_url)
+
+            resultado = {
+                "localidad": localidad,
+                "tipo_empresa": tipo,
+                "resultados": empresas
+            }
 
-        tipo, localidad = extraer_info_url(base_url)
+            nombre_archivo = generar_nombre_archivo(base_url)
+            output = OUTPUT_DIR / nombre_archivo.replace(".json", f"_pagina_{pagina}.json")
 
-        resultado = {
-            "localidad": localidad,
-            "tipo_empresa": tipo,
-            "resultados": empresas
-        }
+            with open(output, "w", encoding="utf-8") as f:
+                json.dump(resultado, f, ensure_ascii=False, indent=4)
 
-        nombre_archivo = generar_nombre_archivo(base_url)
-        output = OUTPUT_DIR / nombre_archivo.replace(".json", f"_pagina_{pagina}.json")
+            if checkpoint:
+                checkpoint.pagina_completada(pagina, huella)
 
-        with open(output, "w", encoding="utf-8") as f:
-            json.dump(resultado, f, ensure_ascii=False, indent=4)
+        paginas_ok += 1
+        total_empresas += len(empresas)
+        metricas.contar("paginas")
+        metricas.contar("empresas", len(empresas))
 
         log_func(f"✅ Página {pagina} guardada ({len(empresas)} empresas)")
 
-    log_func("🎉 Scraping finalizado")
+    return paginas_ok, total_empresas
 
 # ---------------- GUI ----------------
 
 def lanzar_gui():
+    import tkinter as tk
+    from tkinter import ttk, messagebox
 
     def log(msg):
         text_log.insert(tk.END, msg + "\n")
@@ -253,7 +575,9 @@ def lanzar_gui():
                 entry_url.get().strip(),
                 int(entry_paginas.get()),
                 var_email_web.get(),
-                log
+                log,
+                reanudar=var_reanudar.get(),
+                refrescar=var_refrescar.get(),
             )
             messagebox.showinfo("Finalizado", "Scraping completado")
         except ValueError:
@@ -278,6 +602,12 @@ def lanzar_gui():
     var_email_web = tk.BooleanVar(value=True)
     ttk.Checkbutton(frame, text="Buscar email en web externa", variable=var_email_web).pack(anchor="w")
 
+    var_reanudar = tk.BooleanVar(value=False)
+    ttk.Checkbutton(frame, text="Reanudar búsqueda interrumpida", variable=var_reanudar).pack(anchor="w")
+
+    var_refrescar = tk.BooleanVar(value=False)
+    ttk.Checkbutton(frame, text="Refrescar empresas ya vistas", variable=var_refrescar).pack(anchor="w")
+
     ttk.Button(frame, text="Iniciar scraping", command=ejecutar).pack(pady=10)
 
     text_log = tk.Text(frame, height=15)
@@ -0,0 +1,86 @@
+"""
+Tiempo de arranque de los puntos de entrada (importar el módulo, sin ejecutar).
+
+Cada medida es un proceso nuevo con `python -X importtime`, así no influye la
+cache de módulos del propio benchmark. Informa del tiempo de pared (mediana),
+del tiempo acumulado de import del módulo, de los imports más pesados y de qué
+dependencias pesadas (tkinter, selenium, mysql, bs4, requests) se han cargado.
+
+    python benchmarks/bench_arranque.py [--repeticiones N] [--top N] [modulo ...]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+MODULOS = [
+    "WebScrapper_DAGM_ver6",
+    "WebScrapper_DAGM_ver1_empresite",
+    "Consultor_db_v5",
+    "lote",
+]
+PESADOS = ["tkinter", "selenium", "mysql", "bs4", "requests"]
+
+
+def medir(modulo, directorio):
+    entorno = dict(os.environ, PYTHONPATH=str(RAIZ))
+    inicio = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=directorio, env=entorno, capture_output=True, text=True,
+    )
+    segundos = time.perf_counter() - inicio
+    if proc.returncode != 0:
+        ultima = proc.stderr.strip().splitlines()[-1:] or ["?"]
+        raise RuntimeError(f"{modulo}: {ultima[0]}")
+    return segundos, leer_importtime(proc.stderr)
+
+
+def leer_importtime(salida):
+    """{paquete: microsegundos acumulados} a partir de la salida de -X importtime."""
+    tiempos = {}
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        _, acumulado, nombre = (c.strip() for c in linea[len("import time:"):].split("|"))
+        tiempos[nombre] = int(acumulado)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modulos", nargs="*", default=MODULOS)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="imports pesados a mostrar")
+    args = parser.parse_args()
+
+    # Directorio temporal: los módulos no deben tocar ./resultados al importarse
+    with tempfile.TemporaryDirectory() as directorio:
+        for modulo in args.modulos:
+            paredes = []
+            for _ in range(args.repeticiones):
+                segundos, tiempos = medir(modulo, directorio)
+                paredes.append(segundos)
+
+            propio = tiempos.get(modulo, 0) / 1000
+            raices = {
+                nombre: us for nombre, us in tiempos.items()
+                if "." not in nombre and nombre != modulo
+            }
+            pesados = [p for p in PESADOS if p in tiempos]
+            print(f"{modulo}")
+            print(f"  pared (mediana de {args.repeticiones}): {statistics.median(paredes) * 1000:8.1f} ms")
+            print(f"  import acumulado:            {propio:8.1f} ms")
+            print(f"  dependencias cargadas: {', '.join(pesados) or 'ninguna pesada'}")
+            for nombre, us in sorted(raices.items(), key=lambda x: -x[1])[: args.top]:
+                print(f"    {us / 1000:8.1f} ms  {nombre}")
+
+
+if __name__ == "__main__":
+    main()
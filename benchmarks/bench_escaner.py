@@ -0,0 +1,94 @@
+"""
+Escáner de bytes (escaner.py) frente a las regex sobre el texto decodificado.
+
+Páginas grandes sintéticas:
+  portada       web de empresa de ~2 MB (servidor_local) con el email al final
+  rachas        HTML con rachas largas de [a-zA-Z0-9-.] (data URIs, tokens...)
+                que disparan el backtracking de email_regex
+  telefonos     listado con muchos números que no son teléfonos (10+ dígitos,
+                pegados a letras) antes del primero válido
+
+Para cada una mide r.text + email_regex.findall / telefono_regex.search
+contra buscar_emails / buscar_telefono sobre los bytes, y comprueba que el
+resultado es idéntico.
+
+    python benchmarks/bench_escaner.py [--repeticiones N]
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from escaner import buscar_emails, buscar_telefono  # noqa: E402
+from servidor_local import SERVIDOR_CONFIG, empresa, web_empresa  # noqa: E402
+
+email_regex = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+telefono_regex = re.compile(r"(\+34\s?\d{9}|\b\d{9}\b)")
+
+
+def pagina_portada():
+    cfg = dict(SERVIDOR_CONFIG, relleno_kb=2048)
+    emp = empresa(cfg, "bench", 0)
+    emp.update(host="www.bench-0.test", estado_web=200, email_en="pie")
+    return web_empresa(cfg, emp, "/")[1].encode("utf-8")
+
+
+def pagina_rachas():
+    bloque = (
+        '<img src="data:image/png;base64,' + "iVBORw0KGgo-AAAA.NSUhEUgAA" * 400 + '">\n'
+        '<p>Versión 1.2.3-beta.4 — token ' + "a.b-c." * 300 + "</p>\n"
+    )
+    return ("<html><body>" + bloque * 40 + "<footer>info@rachas.es · +34 912345678</footer></body></html>").encode("utf-8")
+
+
+def pagina_telefonos():
+    fila = "<li>Ref. 12345678901 · CIF B123456789 · código ñ123456789 · pedido 987654321012</li>\n"
+    return ("<ul>" + fila * 5000 + "<li>Tel. 916 123 456 / 916123456</li></ul>").encode("utf-8")
+
+
+def por_regex(datos):
+    texto = datos.decode("utf-8")
+    m = telefono_regex.search(texto)
+    return email_regex.findall(texto), m.group() if m else None
+
+
+def por_escaner(datos):
+    return list(buscar_emails(datos)), buscar_telefono(datos)
+
+
+def medir(funcion, datos, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion(datos)
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escáner de bytes frente a regex")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    paginas = {
+        "portada": pagina_portada(),
+        "rachas": pagina_rachas(),
+        "telefonos": pagina_telefonos(),
+    }
+    print(f"{'página':<10} {'tamaño':>9} {'regex':>10} {'escáner':>10} {'mejora':>7}  salida")
+    for nombre, datos in paginas.items():
+        iguales = por_regex(datos) == por_escaner(datos)
+        t_regex = medir(por_regex, datos, args.repeticiones)
+        t_escaner = medir(por_escaner, datos, args.repeticiones)
+        print(
+            f"{nombre:<10} {len(datos) / 1024:>7.0f}KB {t_regex * 1000:>8.1f}ms "
+            f"{t_escaner * 1000:>8.1f}ms {t_regex / t_escaner:>6.1f}x  "
+            f"{'idéntica' if iguales else 'DISTINTA'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
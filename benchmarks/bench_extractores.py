@@ -0,0 +1,169 @@
+"""
+Benchmark offline de los extractores sobre páginas guardadas en fixtures/.
+
+Casos:
+  tarjetas       extraer_tarjetas de ver6 sobre paginasamarillas_listado*.html
+  listado        extraer_fichas_listado de Empresite (select + extraer_url_ficha_empresite)
+                 sobre empresite_listado*.html
+  url_ficha      extraer_url_ficha_empresite sobre los enlaces ya parseados
+  fichas         extraer_datos_ficha_desde_html sobre empresite_ficha*.html
+
+Para cada caso informa unidades/s (tiempo) y el pico de memoria de una pasada
+(tracemalloc, medido aparte para no falsear el tiempo). Con --guardar-baseline
+escribe los resultados en un JSON; sin él compara contra ese JSON y marca las
+regresiones que superen la tolerancia (código de salida 1).
+
+    python benchmarks/bench_extractores.py [--backend B] [--repeticiones N] [--rondas N]
+    python benchmarks/bench_extractores.py --guardar-baseline
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import WebScrapper_DAGM_ver1_empresite as empresite  # noqa: E402
+import WebScrapper_DAGM_ver6 as ver6  # noqa: E402
+from parser_html import backend_actual, backend_disponible  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+BASELINE = Path(__file__).resolve().parent / "baseline_extractores.json"
+
+
+def cargar(fixtures_dir, patron):
+    return [p.read_text(encoding="utf-8") for p in sorted(fixtures_dir.glob(patron))]
+
+
+def preparar_casos(fixtures_dir, backend):
+    """{caso: (unidad, funcion_de_una_pasada)}; cada pasada devuelve cuántas unidades procesó."""
+    listados_pa = cargar(fixtures_dir, "paginasamarillas_listado*.html")
+    listados_emp = cargar(fixtures_dir, "empresite_listado*.html")
+    fichas = cargar(fixtures_dir, "empresite_ficha*.html")
+    if not (listados_pa and listados_emp and fichas):
+        sys.exit(f"Faltan páginas de ejemplo en {fixtures_dir}")
+
+    anchors = [a for h in listados_emp for a in empresite.extraer_fichas_listado(h, backend)[0]]
+
+    def tarjetas():
+        return sum(len(ver6.extraer_tarjetas(h, backend)) for h in listados_pa)
+
+    def listado():
+        return sum(len(empresite.extraer_fichas_listado(h, backend)[1]) for h in listados_emp)
+
+    def url_ficha():
+        for a in anchors:
+            empresite.extraer_url_ficha_empresite(a)
+        return len(anchors)
+
+    def datos_fichas():
+        for h in fichas:
+            empresite.extraer_datos_ficha_desde_html(h, backend)
+        return len(fichas)
+
+    return {
+        "tarjetas": ("tarjetas", tarjetas),
+        "listado": ("urls", listado),
+        "url_ficha": ("enlaces", url_ficha),
+        "fichas": ("fichas", datos_fichas),
+    }
+
+
+def medir(funcion, repeticiones, rondas=5):
+    """Mejor ronda de `repeticiones` pasadas (la menos afectada por ruido) y pico de memoria."""
+    funcion()  # calentamiento (imports perezosos, regex compiladas...)
+    por_segundo = 0.0
+    for _ in range(rondas):
+        unidades = 0
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            unidades += funcion()
+        por_segundo = max(por_segundo, unidades / (time.perf_counter() - inicio))
+
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return por_segundo, pico
+
+
+def comparar(resultados, baseline, tolerancia):
+    """Imprime la variación frente a la baseline y devuelve los casos que empeoran."""
+    regresiones = []
+    if baseline.get("backend") != resultados["backend"]:
+        print(f"\nAviso: la baseline es de otro backend ({baseline.get('backend')})")
+    print(f"\n{'caso':<10} {'vel. base':>12} {'Δ vel.':>8} {'pico base':>11} {'Δ pico':>8}")
+    for caso, r in resultados["casos"].items():
+        base = baseline.get("casos", {}).get(caso)
+        if not base:
+            print(f"{caso:<10} {'-':>12}  (sin baseline)")
+            continue
+        d_vel = r["por_segundo"] / base["por_segundo"] - 1
+        d_pico = r["pico_kb"] / base["pico_kb"] - 1 if base["pico_kb"] else 0.0
+        marca = ""
+        if d_vel < -tolerancia or d_pico > tolerancia:
+            regresiones.append(caso)
+            marca = "  REGRESIÓN"
+        print(
+            f"{caso:<10} {base['por_segundo']:>12.0f} {d_vel:>+8.0%} "
+            f"{base['pico_kb']:>9.0f}KB {d_pico:>+8.0%}{marca}"
+        )
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline de los extractores")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    parser.add_argument("--backend", default=None, help="selectolax, lxml o html.parser")
+    parser.add_argument("--repeticiones", type=int, default=20, help="pasadas por ronda")
+    parser.add_argument("--rondas", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--guardar-baseline", action="store_true",
+                        help="guardar estos resultados como referencia")
+    parser.add_argument("--tolerancia", type=float, default=0.15,
+                        help="variación relativa admitida antes de marcar regresión")
+    args = parser.parse_args()
+
+    backend = args.backend or backend_actual()
+    if not backend_disponible(backend):
+        sys.exit(f"Backend {backend} no instalado")
+
+    resultados = {
+        "backend": backend,
+        "python": platform.python_version(),
+        "repeticiones": args.repeticiones,
+        "rondas": args.rondas,
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "casos": {},
+    }
+    print(f"backend {backend}, mejor de {args.rondas} rondas x {args.repeticiones} pasadas")
+    print(f"{'caso':<10} {'unidades/s':>12} {'pico':>10}")
+    for caso, (unidad, funcion) in preparar_casos(args.fixtures, backend).items():
+        por_segundo, pico = medir(funcion, args.repeticiones, args.rondas)
+        resultados["casos"][caso] = {
+            "unidad": unidad,
+            "por_segundo": round(por_segundo, 1),
+            "pico_kb": round(pico / 1024, 1),
+        }
+        print(f"{caso:<10} {por_segundo:>12.0f} {pico / 1024:>8.0f}KB  ({unidad}/s)")
+
+    if args.guardar_baseline:
+        args.baseline.write_text(json.dumps(resultados, indent=4), encoding="utf-8")
+        print(f"\nBaseline guardada en {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nSin baseline en {args.baseline} (usa --guardar-baseline)")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if comparar(resultados, baseline, args.tolerancia):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
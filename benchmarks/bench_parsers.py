@@ -0,0 +1,84 @@
+"""
+Benchmark de backends de parseo (selectolax, lxml, html.parser).
+
+Mide tarjetas/s del extractor de Páginas Amarillas (ver6) y fichas/s del
+extractor de Empresite sobre páginas guardadas, y comprueba que todos los
+backends devuelven exactamente lo mismo que html.parser.
+
+    python benchmarks/bench_parsers.py [--fixtures DIR] [--repeticiones N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import WebScrapper_DAGM_ver1_empresite as empresite  # noqa: E402
+import WebScrapper_DAGM_ver6 as ver6  # noqa: E402
+from parser_html import BACKENDS, backend_disponible  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def cargar(fixtures_dir, patron):
+    return [p.read_text(encoding="utf-8") for p in sorted(fixtures_dir.glob(patron))]
+
+
+def medir(func, paginas, backend, repeticiones):
+    unidades = 0
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for html in paginas:
+            unidades += len(func(html, backend))
+    return unidades / (time.perf_counter() - inicio)
+
+
+def tarjetas(html, backend):
+    return ver6.extraer_tarjetas(html, backend)
+
+
+def urls_listado(html, backend):
+    return empresite.extraer_fichas_listado(html, backend)[1]
+
+
+def fichas(html, backend):
+    return [empresite.extraer_datos_ficha_desde_html(html, backend)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    listados = cargar(args.fixtures, "paginasamarillas_listado*.html")
+    paginas_ficha = cargar(args.fixtures, "empresite_ficha*.html")
+    listados_empresite = cargar(args.fixtures, "empresite_listado*.html")
+    if not listados or not paginas_ficha:
+        sys.exit(f"Faltan páginas de ejemplo en {args.fixtures}")
+
+    referencia_tarjetas = [tarjetas(h, "html.parser") for h in listados]
+    referencia_fichas = [fichas(h, "html.parser") for h in paginas_ficha]
+    referencia_urls = [urls_listado(h, "html.parser") for h in listados_empresite]
+
+    print(f"{'backend':<12} {'tarjetas/s':>12} {'fichas/s':>12}  salida")
+    for backend in BACKENDS:
+        if not backend_disponible(backend):
+            print(f"{backend:<12} {'-':>12} {'-':>12}  no instalado")
+            continue
+
+        iguales = (
+            [tarjetas(h, backend) for h in listados] == referencia_tarjetas
+            and [fichas(h, backend) for h in paginas_ficha] == referencia_fichas
+            and [urls_listado(h, backend) for h in listados_empresite] == referencia_urls
+        )
+        tps = medir(tarjetas, listados, backend, args.repeticiones)
+        fps = medir(fichas, paginas_ficha, backend, args.repeticiones)
+        estado = "idéntica" if iguales else "DISTINTA a html.parser"
+        print(f"{backend:<12} {tps:>12.0f} {fps:>12.0f}  {estado}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Micro-benchmark del extractor de tarjetas div.box de ver6.
+
+Compara el extractor de una sola pasada (extraer_datos_tarjeta) con la versión
+anterior campo a campo (select_one/find con regex compiladas en cada tarjeta)
+sobre el mismo árbol ya parseado, y comprueba que la salida es idéntica.
+
+    python benchmarks/bench_tarjetas.py [--fixtures DIR] [--repeticiones N]
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import WebScrapper_DAGM_ver6 as ver6  # noqa: E402
+from parser_html import backend_disponible, parsear  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def extraer_por_campos(empresa):
+    """Extractor anterior de ver6, tal cual estaba dentro del bucle de tarjetas."""
+    data = {
+        "nombre": "No disponible",
+        "telefono": "No disponible",
+        "email": "No disponible",
+        "email_posible_info": "No disponible",
+        "email_posible_contacto": "No disponible",
+        "email_posible_administracion": "No disponible",
+        "web": "No disponible",
+        "direccion": "No disponible",
+        "codigo_postal": "No disponible",
+        "localidad": "No disponible"
+    }
+
+    tag = empresa.select_one("span[itemprop='name']")
+    if tag:
+        data["nombre"] = tag.get_text(strip=True)
+
+    tel_tag = empresa.find("a", href=re.compile(r"^tel:"))
+    if tel_tag:
+        data["telefono"] = ver6.normalizar_telefono(tel_tag["href"].replace("tel:", ""))
+    else:
+        texto = empresa.get_text(" ", strip=True)
+        match = ver6.telefono_regex.search(texto)
+        if match:
+            data["telefono"] = ver6.normalizar_telefono(match.group())
+
+    email_tag = empresa.find("a", href=re.compile(r"^mailto:"))
+    if email_tag:
+        data["email"] = ver6.limpiar_email(email_tag["href"].replace("mailto:", ""))
+
+    web_tag = empresa.find("a", class_=re.compile("web|website", re.I))
+    if not web_tag:
+        for a in empresa.find_all("a", href=True):
+            href = a["href"]
+            if href.startswith("http") and "paginasamarillas" not in href:
+                web_tag = a
+                break
+
+    if web_tag:
+        data["web"] = web_tag["href"].split("?")[0]
+
+    tag = empresa.select_one("span[itemprop='streetAddress']")
+    if tag:
+        data["direccion"] = tag.get_text(strip=True)
+
+    tag = empresa.select_one("span[itemprop='postalCode']")
+    if tag:
+        data["codigo_postal"] = tag.get_text(strip=True)
+
+    tag = empresa.select_one("span[itemprop='addressLocality']")
+    if tag:
+        data["localidad"] = tag.get_text(strip=True)
+
+    return data
+
+
+def us_por_tarjeta(func, tarjetas, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for tarjeta in tarjetas:
+            func(tarjeta)
+    return (time.perf_counter() - inicio) / (repeticiones * len(tarjetas)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    parser.add_argument("--repeticiones", type=int, default=100)
+    args = parser.parse_args()
+
+    paginas = [p.read_text(encoding="utf-8")
+               for p in sorted(args.fixtures.glob("paginasamarillas_listado*.html"))]
+    if not paginas:
+        sys.exit(f"Faltan listados de ejemplo en {args.fixtures}")
+
+    # La versión campo a campo usa find() con regex: solo existe sobre bs4.
+    for backend in ("html.parser", "lxml"):
+        if not backend_disponible(backend):
+            continue
+        tarjetas = [t for html in paginas for t in parsear(html, backend).select("div.box")]
+
+        antes = [extraer_por_campos(t) for t in tarjetas]
+        ahora = [ver6.extraer_datos_tarjeta(t) for t in tarjetas]
+        if antes != ahora:
+            sys.exit(f"[{backend}] La salida de una pasada difiere de la versión campo a campo")
+
+        t_antes = us_por_tarjeta(extraer_por_campos, tarjetas, args.repeticiones)
+        t_ahora = us_por_tarjeta(ver6.extraer_datos_tarjeta, tarjetas, args.repeticiones)
+        print(
+            f"[{backend}] {len(tarjetas)} tarjetas | campo a campo: {t_antes:.1f} µs/tarjeta | "
+            f"una pasada: {t_ahora:.1f} µs/tarjeta | x{t_antes / t_ahora:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Prueba de carga de extremo a extremo de ver6 contra el servidor local.
+
+Arranca servidor_local.py en un hilo, apunta el scraper a él (host del
+directorio inyectado con SCRAPER_HOST_PA y la sesión HTTP usando el servidor
+como proxy) y ejecuta iniciar_scraping completo con cada concurrencia de
+enriquecimiento pedida. Sin cache HTTP y sin límite de tasa, para medir el
+pipeline y no la cortesía.
+
+    python benchmarks/carga_scraping.py --paginas 5 --concurrencias 1,4,8,16
+
+Cada configuración usa una búsqueda distinta (dominios distintos), así el memo
+de dominios no convierte las siguientes en aciertos. Todo se escribe en un
+directorio temporal.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from servidor_local import HOST_DIRECTORIO, ServidorLocal  # noqa: E402
+
+
+def lista_enteros(texto):
+    return [int(x) for x in texto.split(",") if x.strip()]
+
+
+def url_busqueda(etiqueta):
+    return (
+        f"http://{HOST_DIRECTORIO}/search/{etiqueta}/all-ma/madrid/all-is/coslada/"
+        f"all-ba/all-pu/all-nc/1?what={etiqueta}&where=coslada"
+    )
+
+
+def contar_emails(ver6, base_url):
+    """Empresas con email en los JSON por página que ha escrito el scraper."""
+    nombre = ver6.generar_nombre_archivo(base_url).replace(".json", "_pagina_*.json")
+    total = 0
+    for ruta in ver6.OUTPUT_DIR.glob(nombre):
+        resultados = json.loads(ruta.read_text(encoding="utf-8"))["resultados"]
+        total += sum(1 for e in resultados if e["email"] != "No disponible")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de ver6 contra el servidor local")
+    parser.add_argument("--paginas", type=int, default=5)
+    parser.add_argument("--tarjetas", type=int, default=25)
+    parser.add_argument("--concurrencias", type=lista_enteros, default=[1, 4, 8, 16],
+                        help="valores de concurrencia de enriquecimiento, separados por comas")
+    parser.add_argument("--por-host", type=int, default=2)
+    parser.add_argument("--adelantadas", type=int, default=2, help="páginas de listado en prefetch")
+    parser.add_argument("--latencia-web", type=float, default=0.2)
+    parser.add_argument("--errores-web", type=float, default=0.05)
+    parser.add_argument("--relleno-kb", type=int, default=200, help="tamaño de la portada de cada web")
+    parser.add_argument("--reintentos", type=int, default=0,
+                        help="reintentos HTTP (0 para no medir los backoff de los 5xx)")
+    parser.add_argument("--sin-email-web", action="store_true", help="solo listados")
+    args = parser.parse_args()
+
+    servidor = ServidorLocal(config={
+        "paginas": args.paginas,
+        "tarjetas": args.tarjetas,
+        "latencia_web": args.latencia_web,
+        "errores_web": args.errores_web,
+        "relleno_kb": args.relleno_kb,
+    }).arrancar()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        # Antes de importar: ver6 crea ./resultados y lee SCRAPER_HOST_PA al cargarse
+        os.chdir(directorio)
+        os.environ["SCRAPER_HOST_PA"] = HOST_DIRECTORIO
+
+        import WebScrapper_DAGM_ver6 as ver6
+        import sesion_http
+        from cache_http import configurar_cache
+        from enriquecimiento_async import ENRIQUECIMIENTO_CONFIG
+        from limitador import configurar_limitador
+
+        configurar_cache(activa=False)
+        configurar_limitador({"tasa": 1e6, "rafaga": 1e6, "jitter": 0, "hosts": {}})
+        sesion = sesion_http.configurar_sesion({
+            "pool_conexiones": max(args.concurrencias) + args.adelantadas + 2,
+            "reintentos": args.reintentos,
+        })
+        sesion.trust_env = False
+        sesion.proxies = {"http": servidor.proxy}
+
+        print(
+            f"{args.paginas} páginas x {args.tarjetas} tarjetas, latencia web "
+            f"{args.latencia_web}s, errores {args.errores_web:.0%}, por host {args.por_host}"
+        )
+        print(
+            f"{'concurrencia':>12} {'tiempo':>8} {'páginas/s':>10} {'webs/s':>8} "
+            f"{'empresas':>9} {'emails':>7}"
+        )
+        for concurrencia in args.concurrencias:
+            ENRIQUECIMIENTO_CONFIG.update(concurrencia=concurrencia, por_host=args.por_host)
+            servidor.reiniciar_contadores()
+            inicio = time.perf_counter()
+            base_url = url_busqueda(f"carga{concurrencia}")
+            resultado = ver6.iniciar_scraping(
+                base_url, args.paginas, not args.sin_email_web,
+                lambda msg: None, paginas_adelantadas=args.adelantadas, salida_jsonl=None,
+                estadisticas=False,
+            )
+            segundos = time.perf_counter() - inicio
+            c = servidor.contadores
+            webs = c.get("webs", 0) + c.get("errores_web", 0)
+            print(
+                f"{concurrencia:>12} {segundos:>7.1f}s {resultado['paginas'] / segundos:>10.2f} "
+                f"{webs / segundos:>8.1f} {resultado['empresas']:>9} {contar_emails(ver6, base_url):>7}"
+            )
+        os.chdir(RAIZ)
+
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Servidor HTTP local que imita los sitios que visitan los scrapers, para
+pruebas de extremo a extremo y de carga sin tocar las webs reales.
+
+Funciona como proxy HTTP: el scraper pide URLs absolutas con hosts .test y el
+servidor responde según el host:
+
+  directorio.test   listados estilo Páginas Amarillas (tarjetas div.box), con
+                    la página en /.../all-nc/N o /.../all-nc/"N"
+  empresite.test    listados (/<actividad>/<localidad>/[PgNum-N/]) y fichas
+                    (/<NOMBRE>.html) estilo Empresite
+  www.<x>-<n>.test  web de la empresa n, con latencia, errores y sitio del
+                    email según SERVIDOR_CONFIG
+
+Todo se genera de forma determinista a partir de la semilla, así dos
+ejecuciones con la misma configuración sirven exactamente lo mismo.
+
+    python benchmarks/servidor_local.py --puerto 8765 --paginas 10
+
+    SCRAPER_HOST_PA=directorio.test HTTP_PROXY=http://127.0.0.1:8765 \\
+        python WebScrapper_DAGM_ver6.py   # URL: http://directorio.test/search/...
+"""
+import argparse
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# ---------------- CONFIGURACIÓN ----------------
+
+SERVIDOR_CONFIG = {
+    "semilla": 1,
+    "paginas": 10,            # páginas de listado con resultados; las siguientes vienen vacías
+    "tarjetas": 25,           # empresas por página
+    "con_web": 0.8,           # fracción de empresas con web
+    "con_email": 0.2,         # fracción con email directo en el listado
+    "latencia_listado": 0.05, # segundos por página de listado
+    "latencia_web": 0.2,      # segundos medios por web de empresa (exponencial)
+    "errores_web": 0.05,      # fracción de webs que responden 5xx
+    "no_encontradas": 0.05,   # fracción de webs que responden 404
+    # Dónde está el email en la web: reparto entre
+    # portada (arriba), pie (tras ~relleno_kb de HTML), contacto (/contacto),
+    # ajeno (solo un email de otro dominio) y ninguno
+    "email_en": {"portada": 0.3, "pie": 0.3, "contacto": 0.2, "ajeno": 0.1, "ninguno": 0.1},
+    "relleno_kb": 200,
+}
+
+HOST_DIRECTORIO = "directorio.test"
+HOST_EMPRESITE = "empresite.test"
+
+_NOMBRES = ["Asesoría", "Consultoría", "Gestoría", "Talleres", "Reformas", "Clínica", "Abogados"]
+_APELLIDOS = ["García", "López", "Martín", "Sánchez", "Pérez", "Gómez", "Ruiz", "Díaz", "Moreno"]
+_CALLES = ["Calle Mayor", "Avenida de la Constitución", "Calle del Sol", "Plaza de España"]
+
+_pagina_nc = re.compile(r'/all-nc/(?:"|%22)?(\d+)(?:"|%22)?')
+_pagina_empresite = re.compile(r"/PgNum-(\d+)/?$")
+_host_web = re.compile(r"^www\.([a-z0-9-]+)-(\d+)\.test$")
+
+# ---------------- DATOS SINTÉTICOS ----------------
+
+def _slug(texto):
+    texto = texto.lower()
+    for a, b in zip("áéíóúñ", "aeioun"):
+        texto = texto.replace(a, b)
+    return re.sub(r"[^a-z0-9]+", "-", texto).strip("-")
+
+
+def empresa(cfg, busqueda, n):
+    """Datos de la empresa n de una búsqueda; siempre los mismos para la misma semilla."""
+    # La web solo conoce el slug de la búsqueda (va en su host): la semilla sale de él
+    clave = _slug(busqueda)[:20] or "empresa"
+    rnd = random.Random(f"{cfg['semilla']}:{clave}:{n}")
+    nombre = f"{rnd.choice(_NOMBRES)} {rnd.choice(_APELLIDOS)} {rnd.choice(_APELLIDOS)}"
+    host = f"www.{clave}-{n}.test"
+    tirada = rnd.random()
+    lugar = "ninguno"
+    for candidato, peso in cfg["email_en"].items():
+        if tirada < peso:
+            lugar = candidato
+            break
+        tirada -= peso
+    return {
+        "n": n,
+        "nombre": nombre,
+        "telefono": f"9{rnd.randrange(10 ** 8):08d}",
+        "calle": f"{rnd.choice(_CALLES)}, {rnd.randrange(1, 120)}",
+        "host": host if rnd.random() < cfg["con_web"] else None,
+        "email_directo": rnd.random() < cfg["con_email"],
+        "email_en": lugar,
+        "estado_web": (
+            503 if rnd.random() < cfg["errores_web"]
+            else 404 if rnd.random() < cfg["no_encontradas"]
+            else 200
+        ),
+        "latencia_web": rnd.expovariate(1 / cfg["latencia_web"]) if cfg["latencia_web"] else 0.0,
+    }
+
+
+def email_de(emp):
+    return f"info@{emp['host'][4:]}"
+
+
+def _tarjeta(emp):
+    ficha = f"http://{HOST_DIRECTORIO}/f/{_slug(emp['nombre'])}_{emp['n']}.html"
+    botones = [
+        f'<a class="btn btn-amarillo" href="tel:{emp["telefono"]}" data-omniclick="phone">'
+        f'<span itemprop="telephone">{emp["telefono"]}</span></a>'
+    ]
+    if emp["host"]:
+        botones.append(
+            f'<a class="btn btn-white web" href="http://{emp["host"]}/?utm_source=directorio" '
+            f'target="_blank" rel="nofollow">Web</a>'
+        )
+        if emp["email_directo"]:
+            botones.append(f'<a class="btn btn-white" href="mailto:{email_de(emp)}">Email</a>')
+    botones.append(f'<a class="btn btn-white" href="{ficha}#mapa">Cómo llegar</a>')
+    return f"""<div class="box">
+  <div class="row"><div class="col-xs-11 comercial-nombre">
+    <a href="{ficha}" class="nombre-comercio"><h2><span itemprop="name">{emp['nombre']}</span></h2></a>
+  </div></div>
+  <div class="row"><div class="col-xs-12 direccion" itemprop="address">
+    <span itemprop="streetAddress">{emp['calle']}</span>
+    <span itemprop="postalCode">28820</span>
+    <span itemprop="addressLocality">Coslada</span>
+  </div></div>
+  <p class="descripcion">Servicios profesionales para empresas y particulares.</p>
+  <div class="row botonera">
+    {chr(10).join(botones)}
+  </div>
+</div>"""
+
+
+def listado_directorio(cfg, busqueda, pagina):
+    tarjetas = []
+    if 1 <= pagina <= cfg["paginas"]:
+        inicio = (pagina - 1) * cfg["tarjetas"]
+        tarjetas = [_tarjeta(empresa(cfg, busqueda, n)) for n in range(inicio, inicio + cfg["tarjetas"])]
+    total = cfg["paginas"] * cfg["tarjetas"]
+    return f"""<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>{busqueda} - página {pagina}</title></head>
+<body>
+<h1>{busqueda}</h1>
+<p class="resultados">{total} resultados</p>
+<div class="listado">
+{chr(10).join(tarjetas)}
+</div>
+</body></html>"""
+
+
+def web_empresa(cfg, emp, ruta):
+    """(estado, html) de la web de la empresa para la ruta pedida."""
+    if emp["estado_web"] != 200:
+        return emp["estado_web"], f"<html><body><h1>Error {emp['estado_web']}</h1></body></html>"
+
+    email = email_de(emp)
+    if ruta.rstrip("/") == "/contacto":
+        cuerpo = f"<h1>Contacto</h1><p>Escríbenos a {email}</p>" if emp["email_en"] == "contacto" else ""
+        return 200, f"<html><body>{cuerpo}</body></html>"
+    if ruta not in ("", "/"):
+        return 404, "<html><body>No encontrado</body></html>"
+
+    arriba = f"<p>Escríbenos: {email}</p>" if emp["email_en"] == "portada" else ""
+    pie = {
+        "pie": f"<footer>{email}</footer>",
+        "ajeno": "<footer>Diseño web: estudio@ejemplo-agencia.com</footer>",
+    }.get(emp["email_en"], "")
+    bloque = "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit. Servicios 24h.</p>\n"
+    relleno = bloque * (cfg["relleno_kb"] * 1024 // len(bloque))
+    return 200, f"""<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>{emp['nombre']}</title></head>
+<body>
+<nav><a href="/">Inicio</a> <a href="/servicios">Servicios</a> <a href="/contacto">Contacto</a></nav>
+<h1>{emp['nombre']}</h1>
+{arriba}
+{relleno}
+{pie}
+</body></html>"""
+
+
+def listado_empresite(cfg, partes, pagina):
+    actividad = partes[0] if partes else "EMPRESAS"
+    enlaces = []
+    if 1 <= pagina <= cfg["paginas"]:
+        inicio = (pagina - 1) * cfg["tarjetas"]
+        for n in range(inicio, inicio + cfg["tarjetas"]):
+            emp = empresa(cfg, "empresite", n)
+            slug = f"{_slug(emp['nombre']).upper()}-{n}"
+            enlaces.append(
+                f'<li><a href="/{slug}.html" title="{emp["nombre"]}">{emp["nombre"].upper()}</a></li>'
+            )
+    return f"""<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>{actividad} - Pagina {pagina}</title></head>
+<body>
+<p class="total">{cfg['paginas'] * cfg['tarjetas']} empresas</p>
+<ul class="resultados">
+{chr(10).join(enlaces)}
+</ul>
+<footer><a href="/aviso-legal.html">Aviso legal</a></footer>
+</body></html>"""
+
+
+def ficha_empresite(cfg, nombre):
+    n = int(nombre.rsplit("-", 1)[-1]) if nombre.rsplit("-", 1)[-1].isdigit() else 0
+    emp = empresa(cfg, "empresite", n)
+    email = ""
+    if emp["host"] and emp["email_directo"]:
+        email = f'<li>Email: <a class="email" href="mailto:{email_de(emp)}">{email_de(emp)}</a></li>'
+    web = f'<li>Web: <a class="url" href="{emp["host"]}">{emp["host"]}</a></li>' if emp["host"] else ""
+    return f"""<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>{nombre} | Empresite</title></head>
+<body><section class="ficha">
+<h1 class="nombre">{emp['nombre'].upper()}</h1>
+<ul class="datos">
+<li>Dirección: {emp['calle']} - 28820 COSLADA (MADRID)</li>
+<li>Teléfono: <a href="tel:{emp['telefono']}" class="tel">{emp['telefono']}</a></li>
+{email}
+{web}
+</ul>
+</section></body></html>"""
+
+# ---------------- SERVIDOR ----------------
+
+class ManejadorLocal(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como los sitios reales
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        host = (url.hostname or self.headers.get("Host", "")).split(":")[0].lower()
+        cfg = self.server.config
+        m_web = _host_web.match(host)
+
+        if host == HOST_DIRECTORIO:
+            m = _pagina_nc.search(url.path)
+            pagina = int(m.group(1)) if m else 1
+            busqueda = parse_qs(url.query).get("what", ["empresas"])[0]
+            time.sleep(cfg["latencia_listado"])
+            self.server.contar("listados")
+            self._responder(200, listado_directorio(cfg, busqueda, pagina))
+        elif host == HOST_EMPRESITE:
+            time.sleep(cfg["latencia_listado"])
+            partes = [p for p in url.path.split("/") if p]
+            if len(partes) == 1 and partes[0].endswith(".html"):
+                self.server.contar("fichas")
+                self._responder(200, ficha_empresite(cfg, partes[0][:-5]))
+            else:
+                m = _pagina_empresite.search(url.path)
+                self.server.contar("listados")
+                self._responder(200, listado_empresite(cfg, partes, int(m.group(1)) if m else 1))
+        elif m_web:
+            emp = empresa(cfg, m_web.group(1), int(m_web.group(2)))
+            time.sleep(emp["latencia_web"])
+            estado, html = web_empresa(cfg, emp, url.path)
+            self.server.contar("webs" if estado == 200 else "errores_web")
+            self._responder(estado, html)
+        else:
+            self._responder(404, "<html><body>Host desconocido</body></html>")
+
+    def _responder(self, estado, html):
+        cuerpo = html.encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+class ServidorLocal(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, direccion=("127.0.0.1", 0), config=None):
+        super().__init__(direccion, ManejadorLocal)
+        self.config = dict(SERVIDOR_CONFIG)
+        self.config.update(config or {})
+        self._lock = threading.Lock()
+        self.contadores = {}
+
+    def handle_error(self, request, client_address):
+        # El cliente puede cortar a mitad de respuesta (p.ej. al encontrar el email)
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+    @property
+    def proxy(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def contar(self, clave):
+        with self._lock:
+            self.contadores[clave] = self.contadores.get(clave, 0) + 1
+
+    def reiniciar_contadores(self):
+        with self._lock:
+            self.contadores = {}
+
+    def arrancar(self):
+        """Atiende peticiones en un hilo de fondo; devuelve el propio servidor."""
+        threading.Thread(target=self.serve_forever, name="servidor_local", daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de pruebas para los scrapers")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--paginas", type=int, default=SERVIDOR_CONFIG["paginas"])
+    parser.add_argument("--tarjetas", type=int, default=SERVIDOR_CONFIG["tarjetas"])
+    parser.add_argument("--latencia-web", type=float, default=SERVIDOR_CONFIG["latencia_web"])
+    parser.add_argument("--errores-web", type=float, default=SERVIDOR_CONFIG["errores_web"])
+    args = parser.parse_args()
+
+    servidor = ServidorLocal(("127.0.0.1", args.puerto), {
+        "paginas": args.paginas,
+        "tarjetas": args.tarjetas,
+        "latencia_web": args.latencia_web,
+        "errores_web": args.errores_web,
+    })
+    print(f"Proxy de pruebas en {servidor.proxy} ({HOST_DIRECTORIO}, {HOST_EMPRESITE}, www.*.test)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# ---------------- CONFIGURACIÓN ----------------
+
+CACHE_CONFIG = {
+    "activa": True,
+    "directorio": Path("resultados") / "cache_http",
+    # Segundos durante los que una respuesta se sirve sin tocar la red
+    # (reejecución offline). Con 0 siempre se revalida con ETag/Last-Modified.
+    "ttl": 0,
+}
+
+_CABECERAS_GUARDADAS = ("Content-Type", "ETag", "Last-Modified")
+
+# ---------------- CACHE ----------------
+
+class CacheHTTP:
+    """
+    Cache en disco direccionada por contenido: el índice (por URL) apunta al
+    sha256 del cuerpo, así páginas idénticas se guardan una sola vez.
+    """
+
+    def __init__(self, directorio, ttl=0):
+        self.directorio = Path(directorio)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self):
+        self.stats = {"aciertos": 0, "revalidados": 0, "fallos": 0, "bytes_ahorrados": 0}
+
+    def _contar(self, clave, bytes_ahorrados=0):
+        with self._lock:
+            self.stats[clave] += 1
+            self.stats["bytes_ahorrados"] += bytes_ahorrados
+
+    # ---- rutas ----
+
+    def _ruta_indice(self, url):
+        clave = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directorio / "indice" / clave[:2] / f"{clave}.json"
+
+    def _ruta_cuerpo(self, digest):
+        return self.directorio / "cuerpos" / digest[:2] / digest
+
+    @staticmethod
+    def _escribir(ruta, datos):
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ruta.with_name(f"{ruta.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(datos)
+        os.replace(tmp, ruta)
+
+    # ---- lectura ----
+
+    def buscar(self, url):
+        ruta = self._ruta_indice(url)
+        try:
+            meta = json.loads(ruta.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not self._ruta_cuerpo(meta["sha256"]).exists():
+            return None
+        return meta
+
+    def fresca(self, meta):
+        return self.ttl > 0 and time.time() - meta["guardado"] < self.ttl
+
+    def cabeceras_condicionales(self, meta):
+        cabeceras = {}
+        if meta["cabeceras"].get("ETag"):
+            cabeceras["If-None-Match"] = meta["cabeceras"]["ETag"]
+        if meta["cabeceras"].get("Last-Modified"):
+            cabeceras["If-Modified-Since"] = meta["cabeceras"]["Last-Modified"]
+        return cabeceras
+
+    def respuesta(self, meta):
+        """Reconstruye un requests.Response a partir de la entrada guardada."""
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        r = requests.Response()
+        r.status_code = 200
+        r.url = meta["url"]
+        r._content = self._ruta_cuerpo(meta["sha256"]).read_bytes()
+        r.headers = CaseInsensitiveDict(meta["cabeceras"])
+        r.encoding = meta.get("encoding")
+        r.reason = "OK"
+        return r
+
+    # ---- escritura ----
+
+    def aprovechable(self, r):
+        """
+        Solo compensa guardar lo que se podrá reutilizar: con TTL se sirve tal
+        cual; sin él hace falta un validador para revalidarlo con un 304.
+        """
+        return self.ttl > 0 or "ETag" in r.headers or "Last-Modified" in r.headers
+
+    def olvidar(self, url):
+        try:
+            self._ruta_indice(url).unlink()
+        except OSError:
+            pass
+
+    def guardar(self, url, r):
+        cuerpo = r.content
+        digest = hashlib.sha256(cuerpo).hexdigest()
+        ruta_cuerpo = self._ruta_cuerpo(digest)
+        if not ruta_cuerpo.exists():
+            self._escribir(ruta_cuerpo, cuerpo)
+        meta = {
+            "url": url,
+            "sha256": digest,
+            "tamano": len(cuerpo),
+            "encoding": r.encoding,
+            "guardado": time.time(),
+            "cabeceras": {k: r.headers[k] for k in _CABECERAS_GUARDADAS if k in r.headers},
+        }
+        self._escribir(self._ruta_indice(url), json.dumps(meta).encode("utf-8"))
+
+    def refrescar(self, url, meta, r):
+        """Tras un 304: renueva la fecha y los validadores que haya mandado el servidor."""
+        meta["guardado"] = time.time()
+        for k in ("ETag", "Last-Modified"):
+            if k in r.headers:
+                meta["cabeceras"][k] = r.headers[k]
+        self._escribir(self._ruta_indice(url), json.dumps(meta).encode("utf-8"))
+
+    # ---- uso desde la capa HTTP ----
+
+    def get(self, url, descargar, headers=None):
+        """
+        Sirve `url` desde la cache si está dentro del TTL; si no, llama a
+        descargar(headers) con las cabeceras condicionales y actualiza la cache.
+        """
+        meta = self.buscar(url)
+        if meta and self.fresca(meta):
+            self._contar("aciertos", meta["tamano"])
+            return self.respuesta(meta)
+
+        cabeceras = dict(headers or {})
+        if meta:
+            cabeceras.update(self.cabeceras_condicionales(meta))
+        r = descargar(cabeceras)
+
+        if r.status_code == 304 and meta:
+            self.refrescar(url, meta, r)
+            self._contar("revalidados", meta["tamano"])
+            return self.respuesta(meta)
+
+        self._contar("fallos")
+        if r.status_code == 200:
+            if self.aprovechable(r):
+                try:
+                    self.guardar(url, r)
+                except OSError:
+                    pass
+            elif meta:
+                # El servidor ya no manda validadores: la entrada no sirve
+                self.olvidar(url)
+        return r
+
+
+_cache = None
+_lock_global = threading.Lock()
+
+
+def cache_global():
+    """Cache compartida por la capa HTTP (None si está desactivada)."""
+    global _cache
+    with _lock_global:
+        if _cache is None and CACHE_CONFIG["activa"]:
+            _cache = CacheHTTP(CACHE_CONFIG["directorio"], CACHE_CONFIG["ttl"])
+        return _cache
+
+
+def configurar_cache(activa=True, directorio=None, ttl=None):
+    global _cache
+    with _lock_global:
+        CACHE_CONFIG["activa"] = activa
+        if directorio is not None:
+            CACHE_CONFIG["directorio"] = Path(directorio)
+        if ttl is not None:
+            CACHE_CONFIG["ttl"] = ttl
+        _cache = CacheHTTP(CACHE_CONFIG["directorio"], CACHE_CONFIG["ttl"]) if activa else None
+        return _cache
+
+
+def log_estadisticas_cache(log_func):
+    cache = cache_global()
+    if cache is None:
+        return
+    s = cache.stats
+    total = s["aciertos"] + s["revalidados"] + s["fallos"]
+    if not total:
+        return
+    ratio = (s["aciertos"] + s["revalidados"]) / total * 100
+    log_func(
+        f"💾 Cache HTTP: {s['aciertos']} aciertos, {s['revalidados']} revalidados (304), "
+        f"{s['fallos']} fallos ({ratio:.0f}% servido desde cache), "
+        f"{s['bytes_ahorrados'] / 1024:.0f} KB ahorrados"
+    )
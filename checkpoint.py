@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+# ---------------- CONFIGURACIÓN ----------------
+
+CHECKPOINT_DIR = Path("resultados") / "checkpoints"
+# Cada avance se añade a un diario; cada N avances se reescribe el checkpoint
+# completo y se vacía el diario, así el coste por ficha no crece con la búsqueda.
+CHECKPOINT_COMPACTAR_CADA = 500
+
+# ---------------- CHECKPOINT ----------------
+
+class Checkpoint:
+    """
+    Progreso de una búsqueda (clave: generar_nombre_archivo del scraper):
+    páginas completadas (con la huella de sus tarjetas), páginas que anuncia
+    el directorio, fichas procesadas y claves de dedup `vistas`.
+    Cada avance se anota (y se vuelca a disco) en un diario .log; el .json
+    completo se reescribe de forma atómica cada CHECKPOINT_COMPACTAR_CADA
+    avances. Al reanudar se carga el .json y se aplica el diario encima.
+    """
+
+    def __init__(self, nombre_busqueda, directorio=CHECKPOINT_DIR,
+                 compactar_cada=CHECKPOINT_COMPACTAR_CADA):
+        nombre = Path(nombre_busqueda).stem
+        self.ruta = Path(directorio) / f"{nombre}.checkpoint.json"
+        self.ruta_diario = Path(directorio) / f"{nombre}.checkpoint.log"
+        self.compactar_cada = compactar_cada
+        self.paginas_completadas = set()
+        self.urls_detalle = set()
+        self.vistas = set()
+        self.paginas_anunciadas = None
+        self.huellas = {}
+        self._anotados = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def abrir(cls, nombre_busqueda, reanudar=False, directorio=CHECKPOINT_DIR):
+        """Con reanudar carga el progreso guardado; sin él empieza de cero."""
+        cp = cls(nombre_busqueda, directorio)
+        if reanudar:
+            cp._cargar()
+        else:
+            cp.guardar()
+        return cp
+
+    def _cargar(self):
+        try:
+            datos = json.loads(self.ruta.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        self.paginas_completadas = set(datos.get("paginas_completadas", []))
+        self.urls_detalle = set(datos.get("urls_detalle", []))
+        self.vistas = {tuple(v) for v in datos.get("vistas", [])}
+        self.paginas_anunciadas = datos.get("paginas_anunciadas")
+        self.huellas = datos.get("huellas", {})
+        self._aplicar_diario()
+
+    def _aplicar_diario(self):
+        try:
+            f = open(self.ruta_diario, encoding="utf-8")
+        except OSError:
+            return
+        with f:
+            for linea in f:
+                try:
+                    avance = json.loads(linea)
+                except ValueError:
+                    continue  # última línea cortada por el crash
+                self._aplicar(avance)
+
+    def _aplicar(self, avance):
+        if "pagina" in avance:
+            self.paginas_completadas.add(avance["pagina"])
+            if avance.get("huella"):
+                self.huellas[avance["huella"]] = avance["pagina"]
+        if "anunciadas" in avance:
+            self.paginas_anunciadas = avance["anunciadas"]
+        if "ficha" in avance:
+            self.urls_detalle.add(avance["ficha"])
+        if avance.get("vista"):
+            self.vistas.add(tuple(avance["vista"]))
+
+    @property
+    def reanudado(self):
+        return bool(self.paginas_completadas or self.urls_detalle)
+
+    def guardar(self):
+        """Reescribe el checkpoint completo y vacía el diario."""
+        with self._lock:
+            self._guardar()
+
+    def _guardar(self):
+        datos = {
+            "paginas_completadas": sorted(self.paginas_completadas),
+            "urls_detalle": sorted(self.urls_detalle),
+            "vistas": sorted(list(v) for v in self.vistas),
+            "paginas_anunciadas": self.paginas_anunciadas,
+            "huellas": self.huellas,
+        }
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.ruta.with_name(self.ruta.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.ruta)
+        # Si se corta aquí, el diario se vuelve a aplicar sobre un .json que
+        # ya lo contiene: los avances son conjuntos y no se duplican.
+        with open(self.ruta_diario, "w", encoding="utf-8"):
+            pass
+        self._anotados = 0
+
+    def _anotar(self, avance):
+        with self._lock:
+            self._aplicar(avance)
+            self.ruta_diario.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.ruta_diario, "a", encoding="utf-8") as f:
+                f.write(json.dumps(avance, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._anotados += 1
+            if self._anotados >= self.compactar_cada:
+                self._guardar()
+
+    def pagina_completada(self, pagina, huella=None):
+        avance = {"pagina": pagina}
+        if huella is not None:
+            avance["huella"] = huella
+        self._anotar(avance)
+
+    def fijar_paginas_anunciadas(self, paginas):
+        self._anotar({"anunciadas": paginas})
+
+    def ficha_procesada(self, url_detalle, vista=None):
+        """`vista`: clave de dedup que ha añadido esta ficha, para el diario."""
+        avance = {"ficha": url_detalle}
+        if vista is not None:
+            avance["vista"] = list(vista)
+        self._anotar(avance)
@@ -0,0 +1,66 @@
+import random
+import threading
+import time
+
+# ---------------- PLANIFICADOR DE CORTESÍA ----------------
+
+class PlanificadorCortesia:
+    """
+    Pausas "humanas" entre navegaciones de un mismo navegador, fuera del
+    camino de carga de la página: tras cada navegación se programa cuándo
+    puede empezar la siguiente (pausa aleatoria según el tipo y un cooldown
+    cada N fichas) y `esperar()` solo duerme lo que quede. El parseo y la
+    escritura de la página anterior se solapan así con la pausa.
+    """
+
+    def __init__(self, pausas, cooldown_cada=0, cooldown=(0.0, 0.0), metricas=None,
+                 log_func=None):
+        self.pausas = dict(pausas)   # tipo de navegación -> (min, max) segundos
+        self.cooldown_cada = cooldown_cada
+        self.cooldown = cooldown
+        self.metricas = metricas
+        self.log_func = log_func
+        self.fichas = 0
+        self._siguiente = 0.0
+        self._cooldown_pendiente = 0.0
+        self._lock = threading.Lock()
+
+    def programar(self, tipo):
+        """Registra una navegación de `tipo` y programa la pausa hasta la siguiente."""
+        minimo, maximo = self.pausas.get(tipo, (0.0, 0.0))
+        with self._lock:
+            self._siguiente = max(self._siguiente, time.monotonic() + random.uniform(minimo, maximo))
+            if tipo == "ficha":
+                self.fichas += 1
+                if self.cooldown_cada and self.fichas % self.cooldown_cada == 0:
+                    self._cooldown_pendiente = random.uniform(*self.cooldown)
+
+    def esperar(self, mientras=None):
+        """
+        Bloquea hasta que se pueda navegar. `mientras` (p.ej. un scroll sobre
+        la página actual) se ejecuta dentro de la pausa si queda tiempo.
+        """
+        with self._lock:
+            restante = self._siguiente - time.monotonic()
+            cooldown, self._cooldown_pendiente = self._cooldown_pendiente, 0.0
+        if restante > 0 and mientras is not None:
+            if self.metricas is not None:
+                with self.metricas.etapa("espera"):
+                    mientras()
+            else:
+                mientras()
+            restante = self._siguiente - time.monotonic()
+        if restante > 0:
+            self._dormir(restante, "espera")
+        if cooldown > 0:
+            if self.log_func:
+                self.log_func(
+                    f"Cooldown anti-bloqueo: esperando {cooldown:.0f}s tras {self.fichas} fichas."
+                )
+            self._dormir(cooldown, "cooldown")
+
+    def _dormir(self, segundos, etapa):
+        if self.metricas is not None:
+            self.metricas.dormir(segundos, etapa)
+        else:
+            time.sleep(segundos)
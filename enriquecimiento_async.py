@@ -0,0 +1,187 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from paginas_contacto import PaginasContacto
+
+# ---------------- CONFIGURACIÓN ----------------
+
+ENRIQUECIMIENTO_CONFIG = {
+    "concurrencia": 8,   # webs consultadas a la vez en total
+    "por_host": 2,       # webs consultadas a la vez contra un mismo host
+    "plazo": 12.0,       # segundos máximos por portada (las páginas de contacto llevan el suyo)
+}
+
+# ---------------- ENRIQUECIMIENTO ----------------
+
+def enriquecer_emails(empresas, buscar_email, config=None, log_func=None):
+    """
+    Busca en paralelo el email de las empresas del lote que tienen web y no email,
+    y lo fusiona en cada dict. `buscar_email(url)` es la función bloqueante de
+    cada scraper (p.ej. obtener_email_web). Si devuelve un PaginasContacto, sus
+    páginas se descargan aquí en paralelo, con los mismos cupos global y por
+    host que las portadas. Devuelve cuántos emails se encontraron.
+    """
+    cfg = dict(ENRIQUECIMIENTO_CONFIG)
+    cfg.update(config or {})
+
+    pendientes = [
+        data for data in empresas
+        if data["email"] == "No disponible" and data["web"] != "No disponible"
+    ]
+    if not pendientes:
+        return 0
+
+    emails = asyncio.run(_enriquecer(pendientes, buscar_email, cfg, log_func))
+
+    encontrados = 0
+    for data, email in zip(pendientes, emails):
+        if email:
+            data["email"] = email
+            encontrados += 1
+    return encontrados
+
+
+async def _enriquecer(pendientes, buscar_email, cfg, log_func):
+    loop = asyncio.get_running_loop()
+    sem_global = asyncio.Semaphore(cfg["concurrencia"])
+    sems_host = {}
+    executor = _executor_global(cfg["concurrencia"])
+    en_curso = []
+
+    async def en_cupo(host, funcion, plazo):
+        """
+        funcion() en el executor compartido con un cupo global y uno del host.
+        Los cupos se liberan cuando termina la ejecución real, no al vencer el
+        plazo: así la concurrencia contra cada host nunca supera el límite.
+        """
+        sem_host = sems_host.setdefault(host, asyncio.Semaphore(cfg["por_host"]))
+
+        # Primero el cupo del host: así una web lenta con muchas fichas
+        # no acapara huecos del cupo global mientras espera.
+        await sem_host.acquire()
+        try:
+            await sem_global.acquire()
+        except BaseException:
+            sem_host.release()
+            raise
+
+        def liberar_cupos():
+            sem_global.release()
+            sem_host.release()
+
+        def liberar(_):
+            # Se llama desde el hilo de la descarga, que puede acabar cuando
+            # la página ya terminó y asyncio.run ya cerró el bucle.
+            try:
+                loop.call_soon_threadsafe(liberar_cupos)
+            except RuntimeError:
+                pass
+
+        empezada = asyncio.Event()
+
+        def ejecutar():
+            try:
+                loop.call_soon_threadsafe(empezada.set)
+            except RuntimeError:
+                pass
+            return funcion()
+
+        tarea = executor.submit(ejecutar)
+        tarea.add_done_callback(liberar)
+        fut = asyncio.wrap_future(tarea)
+        en_curso.append(fut)
+        # El plazo cuenta desde que hay hilo libre: el executor es compartido
+        # y puede estar ocupado aún con búsquedas lentas de otra página.
+        try:
+            await empezada.wait()
+        except asyncio.CancelledError:
+            tarea.cancel()  # aún en cola: no llega a ejecutarse
+            raise
+        return await asyncio.wait_for(asyncio.shield(fut), plazo)
+
+    async def contacto(host, paginas):
+        """Primer email de las páginas de contacto, todas a la vez dentro de su plazo."""
+        limite = time.monotonic() + paginas.plazo
+
+        def mirar(enlace):
+            return lambda: paginas.buscar(enlace, max(0.1, limite - time.monotonic()))
+
+        pendientes = {
+            asyncio.ensure_future(en_cupo(host, mirar(enlace), paginas.plazo))
+            for enlace in paginas.urls
+        }
+        completo = True
+        try:
+            while pendientes:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    completo = False
+                    break
+                hechos, pendientes = await asyncio.wait(
+                    pendientes, timeout=restante, return_when=asyncio.FIRST_COMPLETED
+                )
+                for hecho in hechos:
+                    try:
+                        resultado = hecho.result()
+                    except Exception:
+                        completo = False
+                        continue
+                    if resultado:
+                        return paginas.terminar(resultado, True)
+            return paginas.terminar(None, completo)
+        finally:
+            # Las que aún esperan cupo no llegan a descargarse
+            for pendiente in pendientes:
+                pendiente.cancel()
+
+    async def buscar(data):
+        url = data["web"]
+        host = urlparse(url).netloc.lower()
+        try:
+            resultado = await en_cupo(host, lambda: buscar_email(url), cfg["plazo"])
+            if isinstance(resultado, PaginasContacto):
+                resultado = await contacto(host, resultado)
+            return resultado
+        except asyncio.TimeoutError:
+            if log_func:
+                log_func(f"⏱️ Plazo agotado buscando email en {url}")
+            return None
+        except Exception:
+            return None
+
+    try:
+        return await asyncio.gather(*(buscar(data) for data in pendientes))
+    finally:
+        # Las descargas que superaron el plazo siguen en el executor compartido
+        # (no se acumulan hilos entre páginas); se desengancha su resultado de
+        # este bucle, que está a punto de cerrarse.
+        for fut in en_curso:
+            fut.cancel()
+
+# ---------------- EXECUTOR COMPARTIDO ----------------
+
+_executor = None
+_hilos = 0
+_lock_executor = threading.Lock()
+
+
+def _executor_global(max_workers):
+    """
+    Un único pool de hilos para toda la ejecución, no uno por página. Si una
+    ejecución pide más hilos que el pool actual se crea uno mayor; el anterior
+    termina sus descargas en curso y sus hilos salen (no se le encola nada más).
+    """
+    global _executor, _hilos
+    with _lock_executor:
+        if _executor is None or max_workers > _hilos:
+            anterior = _executor
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="enriquecimiento"
+            )
+            _hilos = max_workers
+            if anterior is not None:
+                anterior.shutdown(wait=False)
+        return _executor
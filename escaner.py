@@ -0,0 +1,179 @@
+"""
+Búsqueda de emails y teléfonos sin regex de backtracking, sobre los bytes
+crudos de la respuesta (o sobre texto ya decodificado).
+
+Devuelve exactamente lo mismo que los patrones de los scrapers aplicados al
+texto decodificado:
+
+    email_regex    = [a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\\.[a-zA-Z0-9-.]+
+    telefono_regex = (\\+34\\s?\\d{9}|\\b\\d{9}\\b)
+
+Emails: se salta de '@' en '@' y se expande hacia los lados; la parte local
+se mide con rstrip (en C) en vez de dejar que la regex pruebe cada inicio de
+las rachas largas de [a-zA-Z0-9-.]. Teléfonos: candidatos '+34' y rachas de
+exactamente 9 dígitos, con los límites de palabra comprobados sobre el
+carácter Unicode vecino (una 'ñ' pegada a los dígitos impide el \\b igual que
+en el texto). Los bytes se interpretan como UTF-8 (o la codificación indicada);
+en bytes solo se reconocen dígitos ASCII.
+"""
+import re
+
+_LOCAL = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.+-"
+_LOCAL_BYTES = _LOCAL.encode("ascii")
+
+_dominio_regex = re.compile(r"[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+_dominio_regex_bytes = re.compile(rb"[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+_nueve_regex = re.compile(r"(?<!\d)\d{9}(?!\d)")
+# En bytes, las rachas de dígitos se buscan con find sobre una copia en la
+# que todo dígito es b"0" (translate y find van en C)
+_A_CEROS = bytes.maketrans(b"0123456789", b"0" * 10)
+_NUEVE_CEROS = b"0" * 9
+
+_VENTANA = 256
+
+# ---------------- EMAILS ----------------
+
+def buscar_emails(datos):
+    """Generador con los emails de `datos` (bytes o str), como email_regex.findall."""
+    es_bytes = isinstance(datos, (bytes, bytearray))
+    arroba, local, dominio_regex = (
+        (b"@", _LOCAL_BYTES, _dominio_regex_bytes) if es_bytes
+        else ("@", _LOCAL, _dominio_regex)
+    )
+
+    pos = 0
+    while True:
+        a = datos.find(arroba, pos)
+        if a < 0:
+            return
+        m = dominio_regex.match(datos, a + 1)
+        if m is None:
+            pos = a + 1
+            continue
+
+        # Parte local: racha de caracteres válidos justo antes de la '@', sin
+        # retroceder más allá del final del email anterior
+        inicio = a
+        while inicio > pos:
+            desde = max(pos, inicio - _VENTANA)
+            trozo = datos[desde:inicio]
+            quitado = len(trozo) - len(trozo.rstrip(local))
+            inicio -= quitado
+            if quitado < len(trozo):
+                break
+        if inicio == a:
+            pos = a + 1
+            continue
+
+        email = datos[inicio:m.end()]
+        yield email.decode("ascii") if es_bytes else email
+        pos = m.end()
+
+
+def primer_email_dominio(datos, dominio, limpiar=None):
+    """Primer email que contiene `dominio` (tras limpiar(email) si se indica)."""
+    for email in buscar_emails(datos):
+        if limpiar:
+            email = limpiar(email)
+        if dominio in email:
+            return email
+    return None
+
+# ---------------- TELÉFONOS ----------------
+
+def _es_palabra(c):
+    return c == "_" or c.isalnum()
+
+
+def _antes(datos, i, encoding):
+    """Carácter que termina justo antes de la posición i ('' al principio)."""
+    if i <= 0:
+        return ""
+    if isinstance(datos, str):
+        return datos[i - 1]
+    inicio = i - 1
+    if encoding == "utf-8":
+        # Retrocede sobre los bytes de continuación (10xxxxxx) del carácter
+        while inicio > 0 and i - inicio < 4 and 0x80 <= datos[inicio] < 0xC0:
+            inicio -= 1
+    return datos[inicio:i].decode(encoding, "replace")[-1:]
+
+
+def _despues(datos, i, encoding):
+    """(carácter que empieza en la posición i, su ancho); ('', 0) al final."""
+    if i >= len(datos):
+        return "", 0
+    if isinstance(datos, str):
+        return datos[i], 1
+    ancho = 1
+    if encoding == "utf-8":
+        primero = datos[i]
+        ancho = 4 if primero >= 0xF0 else 3 if primero >= 0xE0 else 2 if primero >= 0xC0 else 1
+    return datos[i:i + ancho].decode(encoding, "replace")[:1], ancho
+
+
+def _son_digitos(trozo):
+    if isinstance(trozo, str):
+        return len(trozo) == 9 and trozo.isdecimal()
+    return len(trozo) == 9 and trozo.isdigit()
+
+
+def _fin_prefijo(datos, p, encoding):
+    """Fin del match de '\\+34\\s?\\d{9}' que empieza en p, o -1."""
+    i = p + 3
+    if _son_digitos(datos[i:i + 9]):
+        return i + 9
+    c, ancho = _despues(datos, i, encoding)
+    if c.isspace() and _son_digitos(datos[i + ancho:i + ancho + 9]):
+        return i + ancho + 9
+    return -1
+
+
+def _rachas_de_nueve(datos):
+    """Posiciones de inicio de las rachas de exactamente 9 dígitos, en orden."""
+    if isinstance(datos, str):
+        for m in _nueve_regex.finditer(datos):
+            yield m.start()
+        return
+
+    ceros = datos.translate(_A_CEROS)
+    pos = 0
+    while True:
+        i = ceros.find(_NUEVE_CEROS, pos)
+        if i < 0:
+            return
+        fin = i + 9
+        while fin < len(ceros) and ceros[fin] == 0x30:
+            fin += 1
+        # find devuelve el inicio de la racha: pos siempre cae tras un no dígito
+        if fin - i == 9:
+            yield i
+        pos = fin
+
+
+def buscar_telefono(datos, encoding="utf-8"):
+    """
+    Primer teléfono de `datos` (bytes o str) con la misma semántica que
+    telefono_regex.search(texto).group(), o None.
+    """
+    es_str = isinstance(datos, str)
+    prefijo = "+34" if es_str else b"+34"
+
+    p = datos.find(prefijo)
+    rachas = _rachas_de_nueve(datos)
+    inicio = next(rachas, None)
+    while p >= 0 or inicio is not None:
+        # Gana el match que empieza más a la izquierda
+        if p >= 0 and (inicio is None or p < inicio):
+            fin = _fin_prefijo(datos, p, encoding)
+            if fin >= 0:
+                return datos[p:fin] if es_str else datos[p:fin].decode(encoding)
+            p = datos.find(prefijo, p + 1)
+            continue
+
+        fin = inicio + 9
+        if (not _es_palabra(_antes(datos, inicio, encoding))
+                and not _es_palabra(_despues(datos, fin, encoding)[0])):
+            return datos[inicio:fin] if es_str else datos[inicio:fin].decode("ascii")
+        inicio = next(rachas, None)
+    return None
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+# ---------------- CONFIGURACIÓN ----------------
+
+INDICE_CONFIG = {
+    "ruta": Path("resultados") / "indice_empresas.sqlite3",
+    "ttl": 90 * 24 * 3600,     # empresa vista: se reutiliza 90 días (None = siempre)
+    "bloom": True,             # filtro de Bloom en memoria para descartar sin tocar disco
+    "bloom_bits": 1 << 23,     # 1 MB: ~1% de falsos positivos con ~870.000 claves
+    "bloom_hashes": 7,
+    # Dominios de plataformas compartidas: no identifican a una empresa
+    "dominios_compartidos": {
+        "facebook.com", "instagram.com", "linkedin.com", "twitter.com", "x.com",
+        "google.com", "sites.google.com", "business.site", "wixsite.com",
+        "blogspot.com", "wordpress.com", "youtube.com", "tiktok.com", "wa.me",
+    },
+}
+
+# ---------------- CLAVES ----------------
+
+def clave_telefono(telefono):
+    digitos = "".join(c for c in telefono or "" if c.isdigit())
+    if len(digitos) == 11 and digitos.startswith("34"):
+        digitos = digitos[2:]
+    return f"tel:{digitos}" if len(digitos) == 9 else None
+
+
+def clave_dominio(web, compartidos=()):
+    if not web or web == "No disponible":
+        return None
+    dominio = urlparse(web if "//" in web else f"//{web}").netloc.lower().split(":")[0]
+    if dominio.startswith("www."):
+        dominio = dominio[4:]
+    if "." not in dominio or dominio in compartidos:
+        return None
+    return f"dom:{dominio}"
+
+
+def clave_url(url_detalle):
+    if not url_detalle or url_detalle == "No disponible":
+        return None
+    partes = urlparse(url_detalle.strip())
+    return f"url:{partes.netloc.lower()}{partes.path.rstrip('/')}"
+
+
+def claves_empresa(data, compartidos=None):
+    """Claves de dedup de una empresa: teléfono normalizado, dominio de la web y url_detalle."""
+    if compartidos is None:
+        compartidos = INDICE_CONFIG["dominios_compartidos"]
+    claves = (
+        clave_telefono(data.get("telefono")),
+        clave_dominio(data.get("web"), compartidos),
+        clave_url(data.get("url_detalle")),
+    )
+    return [c for c in claves if c]
+
+# ---------------- FILTRO DE BLOOM ----------------
+
+class FiltroBloom:
+    """Conjunto aproximado: 'no está' es seguro, 'está' puede ser un falso positivo."""
+
+    def __init__(self, bits, hashes):
+        self.bits = bits
+        self.hashes = hashes
+        self._tabla = bytearray((bits + 7) // 8)
+
+    def _posiciones(self, clave):
+        digest = hashlib.blake2b(clave.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def anadir(self, clave):
+        for p in self._posiciones(clave):
+            self._tabla[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, clave):
+        return all(self._tabla[p >> 3] & (1 << (p & 7)) for p in self._posiciones(clave))
+
+# ---------------- ÍNDICE ----------------
+
+class IndiceEmpresas:
+    """
+    Índice persistente de empresas ya scrapeadas, entre ejecuciones y
+    búsquedas: cada clave (teléfono, dominio, url_detalle) apunta a los datos
+    con los que se guardó la empresa. SQLite en modo WAL con una conexión por
+    hilo, como el memo de dominios; el filtro de Bloom se rellena al abrir y
+    evita la consulta a disco en las empresas nuevas.
+    """
+
+    def __init__(self, ruta, ttl=None, bloom=True, bloom_bits=1 << 23, bloom_hashes=7):
+        self.ruta = Path(ruta)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        with self._conexion() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS empresa_vista (
+                    clave TEXT PRIMARY KEY,
+                    datos TEXT NOT NULL,
+                    fecha REAL NOT NULL
+                )
+                """
+            )
+
+        self._bloom = None
+        if bloom:
+            self._bloom = FiltroBloom(bloom_bits, bloom_hashes)
+            for (clave,) in self._conexion().execute("SELECT clave FROM empresa_vista"):
+                self._bloom.anadir(clave)
+
+    def _conexion(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.ruta, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def buscar(self, claves):
+        """Datos guardados de la primera clave conocida y vigente, o None."""
+        if self._bloom is not None:
+            with self._lock:
+                claves = [c for c in claves if c in self._bloom]
+        if not claves:
+            return None
+
+        marcas = ",".join("?" * len(claves))
+        filas = self._conexion().execute(
+            f"SELECT clave, datos, fecha FROM empresa_vista WHERE clave IN ({marcas})", claves
+        ).fetchall()
+        por_clave = {clave: (datos, fecha) for clave, datos, fecha in filas}
+        for clave in claves:
+            if clave not in por_clave:
+                continue
+            datos, fecha = por_clave[clave]
+            if self.ttl is None or time.time() - fecha < self.ttl:
+                return json.loads(datos)
+        return None
+
+    def registrar(self, data, claves=None):
+        """Guarda la empresa bajo todas sus claves (sustituye lo anterior)."""
+        claves = claves if claves is not None else claves_empresa(data)
+        if not claves:
+            return
+        datos = json.dumps(data, ensure_ascii=False)
+        fecha = time.time()
+        with self._conexion() as conn:
+            conn.executemany(
+                """
+                INSERT INTO empresa_vista (clave, datos, fecha) VALUES (?, ?, ?)
+                ON CONFLICT(clave) DO UPDATE SET datos = excluded.datos, fecha = excluded.fecha
+                """,
+                [(clave, datos, fecha) for clave in claves],
+            )
+        if self._bloom is not None:
+            with self._lock:
+                for clave in claves:
+                    self._bloom.anadir(clave)
+
+
+_indice = None
+_lock_global = threading.Lock()
+
+
+def indice_global():
+    global _indice
+    with _lock_global:
+        if _indice is None:
+            _indice = IndiceEmpresas(
+                INDICE_CONFIG["ruta"],
+                INDICE_CONFIG["ttl"],
+                INDICE_CONFIG["bloom"],
+                INDICE_CONFIG["bloom_bits"],
+                INDICE_CONFIG["bloom_hashes"],
+            )
+        return _indice
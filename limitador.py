@@ -0,0 +1,92 @@
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+# ---------------- CONFIGURACIÓN ----------------
+
+LIMITES_CONFIG = {
+    "tasa": 1.0,      # peticiones por segundo y host
+    "rafaga": 2,      # peticiones seguidas permitidas antes de empezar a esperar
+    "jitter": 0.3,    # segundos aleatorios extra (0..jitter) en cada espera
+    # Límites propios por dominio (se aplican también a sus subdominios)
+    "hosts": {
+        "paginasamarillas.es": {"tasa": 0.5, "rafaga": 2},
+        "empresite.eleconomista.es": {"tasa": 0.2, "rafaga": 1},
+    },
+}
+
+# ---------------- TOKEN BUCKET ----------------
+
+def host_de(url_o_host):
+    host = urlparse(url_o_host).netloc if "//" in url_o_host else url_o_host
+    host = host.lower().split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+class LimitadorPorHost:
+    """
+    Token bucket por host. `esperar(url)` bloquea solo lo necesario para
+    respetar la tasa de ese host; es seguro entre hilos y reparte los turnos
+    en orden de llegada.
+    """
+
+    def __init__(self, config=None):
+        cfg = dict(LIMITES_CONFIG)
+        cfg.update(config or {})
+        self.tasa = cfg["tasa"]
+        self.rafaga = cfg["rafaga"]
+        self.jitter = cfg["jitter"]
+        self.hosts = dict(cfg.get("hosts") or {})
+        self._cubos = {}
+        self._lock = threading.Lock()
+        self.esperado = {}
+
+    def _limites(self, host):
+        for dominio, limites in self.hosts.items():
+            if host == dominio or host.endswith("." + dominio):
+                return limites.get("tasa", self.tasa), limites.get("rafaga", self.rafaga)
+        return self.tasa, self.rafaga
+
+    def reservar(self, url_o_host):
+        """Reserva un turno y devuelve los segundos que hay que esperar antes de usarlo."""
+        host = host_de(url_o_host)
+        ahora = time.monotonic()
+        with self._lock:
+            tasa, rafaga = self._limites(host)
+            tokens, ultimo = self._cubos.get(host, (rafaga, ahora))
+            tokens = min(rafaga, tokens + (ahora - ultimo) * tasa)
+            # Se permite quedar en negativo: la deuda es la cola de espera del host.
+            tokens -= 1
+            self._cubos[host] = (tokens, ahora)
+            espera = -tokens / tasa if tokens < 0 and tasa > 0 else 0.0
+            if espera > 0 and self.jitter:
+                espera += random.uniform(0, self.jitter)
+            self.esperado[host] = self.esperado.get(host, 0.0) + espera
+        return espera
+
+    def esperar(self, url_o_host):
+        espera = self.reservar(url_o_host)
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+
+_limitador = None
+_lock_global = threading.Lock()
+
+
+def limitador_global():
+    """Limitador compartido por todas las descargas del proceso."""
+    global _limitador
+    with _lock_global:
+        if _limitador is None:
+            _limitador = LimitadorPorHost()
+        return _limitador
+
+
+def configurar_limitador(config=None):
+    global _limitador
+    with _lock_global:
+        _limitador = LimitadorPorHost(config)
+        return _limitador
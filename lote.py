@@ -0,0 +1,142 @@
+"""
+Modo lote sin interfaz: lanza muchas búsquedas (una URL por línea) sobre un
+pool de workers que comparten un único presupuesto de peticiones por host.
+
+    python lote.py busquedas.txt --paginas 5 --workers 4
+
+Las URLs de empresite.eleconomista.es usan el scraper de Empresite (Selenium);
+el resto, el de Páginas Amarillas (ver6). Las líneas vacías o que empiezan
+por # se ignoran.
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import sesion_http
+from WebScrapper_DAGM_ver1_empresite import HOST_EMPRESITE
+from limitador import LIMITES_CONFIG, configurar_limitador
+from metricas import texto_prometheus
+
+_lock_print = threading.Lock()
+
+
+def leer_busquedas(ruta):
+    with open(ruta, encoding="utf-8") as f:
+        return [
+            linea.strip() for linea in f
+            if linea.strip() and not linea.strip().startswith("#")
+        ]
+
+
+def es_empresite(url):
+    return HOST_EMPRESITE in urlparse(url).netloc.lower()
+
+
+def crear_log(etiqueta):
+    def log(msg):
+        with _lock_print:
+            print(f"[{etiqueta}] {msg}", flush=True)
+    return log
+
+
+def ejecutar_busqueda(indice, url, args):
+    log = crear_log(indice)
+    inicio = time.monotonic()
+    resumen = {"url": url, "paginas": 0, "empresas": 0, "error": None}
+    try:
+        if es_empresite(url):
+            import WebScrapper_DAGM_ver1_empresite as empresite
+            url = empresite.aplicar_filtros_empresite(url, args.solo_con_email)
+            # Varios Chrome no pueden compartir el mismo perfil a la vez
+            resultado = empresite.iniciar_scraping(
+                url, args.paginas, log,
+                use_profile=args.workers == 1, reanudar=args.reanudar,
+                refrescar=args.refrescar, fichas_http=args.fichas_http,
+                drivers=args.drivers_fichas, ligero=args.navegador_ligero,
+            )
+        else:
+            import WebScrapper_DAGM_ver6 as ver6
+            resultado = ver6.iniciar_scraping(
+                url, args.paginas, not args.sin_email_web, log,
+                reanudar=args.reanudar, estadisticas=False, refrescar=args.refrescar,
+            )
+        resumen.update(resultado or {})
+    except Exception as exc:
+        resumen["error"] = str(exc) or exc.__class__.__name__
+        log(f"Error: {resumen['error']}")
+    resumen["segundos"] = time.monotonic() - inicio
+    return resumen
+
+
+def imprimir_resumen(resumenes):
+    print()
+    print(f"{'#':>3} {'páginas':>8} {'empresas':>9} {'tiempo':>8}  búsqueda")
+    for indice, r in sorted(resumenes.items()):
+        estado = f"  ERROR: {r['error']}" if r["error"] else ""
+        print(
+            f"{indice:>3} {r['paginas']:>8} {r['empresas']:>9} "
+            f"{r['segundos']:>7.0f}s  {r['url']}{estado}"
+        )
+    print(
+        f"    {sum(r['paginas'] for r in resumenes.values()):>8} "
+        f"{sum(r['empresas'] for r in resumenes.values()):>9}  total"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraping por lotes sin interfaz gráfica")
+    parser.add_argument("fichero", help="fichero con una URL de búsqueda por línea")
+    parser.add_argument("--paginas", type=int, default=3, help="páginas máximas por búsqueda")
+    parser.add_argument("--workers", type=int, default=4, help="búsquedas simultáneas")
+    parser.add_argument("--tasa", type=float, default=LIMITES_CONFIG["tasa"],
+                        help="peticiones/s por host sin límite propio (global para todo el lote)")
+    parser.add_argument("--rafaga", type=int, default=LIMITES_CONFIG["rafaga"])
+    parser.add_argument("--sin-email-web", action="store_true",
+                        help="no buscar emails en las webs de las empresas")
+    parser.add_argument("--solo-con-email", action="store_true",
+                        help="Empresite: solo empresas con email (emp_email=true)")
+    parser.add_argument("--fichas-http", action="store_true",
+                        help="Empresite: fichas por HTTP con la sesión del navegador (modo híbrido)")
+    parser.add_argument("--drivers-fichas", type=int, default=1,
+                        help="Empresite: navegadores que abren fichas a la vez por búsqueda")
+    parser.add_argument("--navegador-ligero", action="store_true",
+                        help="Empresite: Chrome headless sin imágenes, fuentes ni CSS")
+    parser.add_argument("--reanudar", action="store_true",
+                        help="continuar búsquedas interrumpidas desde su checkpoint")
+    parser.add_argument("--refrescar", action="store_true",
+                        help="volver a consultar las empresas ya vistas en búsquedas anteriores")
+    parser.add_argument("--prometheus", metavar="RUTA",
+                        help="escribir las métricas por etapa de todas las búsquedas en formato Prometheus")
+    args = parser.parse_args()
+
+    busquedas = leer_busquedas(args.fichero)
+    if not busquedas:
+        parser.error("el fichero no contiene URLs")
+
+    configurar_limitador({"tasa": args.tasa, "rafaga": args.rafaga})
+    sesion_http.reiniciar_estadisticas()
+
+    inicio = time.monotonic()
+    resumenes = {}
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futuros = {
+            pool.submit(ejecutar_busqueda, i, url, args): i
+            for i, url in enumerate(busquedas, start=1)
+        }
+        for futuro in as_completed(futuros):
+            resumenes[futuros[futuro]] = futuro.result()
+
+    imprimir_resumen(resumenes)
+    if args.prometheus:
+        metricas = [r["metricas"] for _, r in sorted(resumenes.items()) if r.get("metricas")]
+        with open(args.prometheus, "w", encoding="utf-8") as f:
+            f.write(texto_prometheus(metricas))
+        print(f"Métricas de {len(metricas)} búsquedas en {args.prometheus}")
+    sesion_http.log_estadisticas(print)
+    print(f"Lote terminado en {time.monotonic() - inicio:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# ---------------- CONFIGURACIÓN ----------------
+
+MEMO_CONFIG = {
+    "ruta": Path("resultados") / "memo_dominios.sqlite3",
+    "ttl_positivo": 30 * 24 * 3600,   # email encontrado: se reutiliza 30 días
+    "ttl_negativo": 7 * 24 * 3600,    # web sin email: se vuelve a mirar a los 7 días
+    "lru": 4096,                      # dominios en memoria
+}
+
+# ---------------- MEMO ----------------
+
+class MemoDominios:
+    """
+    Memo persistente dominio -> email (o resultado negativo) con TTL.
+    SQLite en modo WAL con una conexión por hilo, así varios scrapes
+    (hilos o procesos) pueden leer y escribir a la vez; delante hay un LRU
+    en memoria para no tocar disco en dominios repetidos.
+    """
+
+    def __init__(self, ruta, ttl_positivo, ttl_negativo, lru=4096):
+        self.ruta = Path(ruta)
+        self.ttl_positivo = ttl_positivo
+        self.ttl_negativo = ttl_negativo
+        self.tam_lru = lru
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        with self._conexion() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS memo_dominio (
+                    dominio TEXT PRIMARY KEY,
+                    email TEXT,
+                    fecha REAL NOT NULL
+                )
+                """
+            )
+
+    def _conexion(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.ruta, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _vigente(self, email, fecha):
+        ttl = self.ttl_positivo if email else self.ttl_negativo
+        return time.time() - fecha < ttl
+
+    def _recordar(self, dominio, email, fecha):
+        with self._lock:
+            self._lru[dominio] = (email, fecha)
+            self._lru.move_to_end(dominio)
+            while len(self._lru) > self.tam_lru:
+                self._lru.popitem(last=False)
+
+    def consultar(self, dominio):
+        """Devuelve (encontrado, email). email es None en los resultados negativos."""
+        with self._lock:
+            entrada = self._lru.get(dominio)
+            if entrada is not None:
+                self._lru.move_to_end(dominio)
+        if entrada is None:
+            fila = self._conexion().execute(
+                "SELECT email, fecha FROM memo_dominio WHERE dominio = ?", (dominio,)
+            ).fetchone()
+            if fila is None:
+                return False, None
+            entrada = (fila[0], fila[1])
+            self._recordar(dominio, *entrada)
+
+        email, fecha = entrada
+        if not self._vigente(email, fecha):
+            return False, None
+        return True, email
+
+    def guardar(self, dominio, email):
+        fecha = time.time()
+        with self._conexion() as conn:
+            conn.execute(
+                """
+                INSERT INTO memo_dominio (dominio, email, fecha) VALUES (?, ?, ?)
+                ON CONFLICT(dominio) DO UPDATE SET email = excluded.email, fecha = excluded.fecha
+                """,
+                (dominio, email, fecha),
+            )
+        self._recordar(dominio, email, fecha)
+
+
+_memo = None
+_lock_global = threading.Lock()
+
+
+def memo_global():
+    global _memo
+    with _lock_global:
+        if _memo is None:
+            _memo = MemoDominios(
+                MEMO_CONFIG["ruta"],
+                MEMO_CONFIG["ttl_positivo"],
+                MEMO_CONFIG["ttl_negativo"],
+                MEMO_CONFIG["lru"],
+            )
+        return _memo
@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# ---------------- MÉTRICAS POR EJECUCIÓN ----------------
+
+class MetricasEjecucion:
+    """
+    Tiempos por etapa (descarga, parseo, enriquecimiento, ficha, cookies,
+    espera, cooldown, escritura...) y contadores de una ejecución de scraping.
+    Seguro entre hilos: la descarga con prefetch se mide desde otro hilo, así
+    que las etapas pueden solaparse y su suma superar la duración total.
+    """
+
+    def __init__(self, scraper, busqueda):
+        self.scraper = scraper
+        self.busqueda = busqueda
+        self.inicio = time.time()
+        self._t0 = time.perf_counter()
+        self.duracion = None
+        self._etapas = {}
+        self._contadores = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def etapa(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sumar(nombre, time.perf_counter() - inicio)
+
+    def sumar(self, nombre, segundos):
+        with self._lock:
+            e = self._etapas.setdefault(nombre, {"llamadas": 0, "segundos": 0.0, "max": 0.0})
+            e["llamadas"] += 1
+            e["segundos"] += segundos
+            e["max"] = max(e["max"], segundos)
+
+    def total(self, nombre):
+        """(llamadas, segundos) acumulados de una etapa."""
+        with self._lock:
+            e = self._etapas.get(nombre)
+            return (e["llamadas"], e["segundos"]) if e else (0, 0.0)
+
+    def dormir(self, segundos, etapa="espera"):
+        """time.sleep contabilizado como etapa."""
+        with self.etapa(etapa):
+            time.sleep(segundos)
+
+    def contar(self, nombre, n=1):
+        with self._lock:
+            self._contadores[nombre] = self._contadores.get(nombre, 0) + n
+
+    def terminar(self):
+        self.duracion = time.perf_counter() - self._t0
+        return self
+
+    def resumen(self):
+        duracion = self.duracion if self.duracion is not None else time.perf_counter() - self._t0
+        with self._lock:
+            etapas = {
+                nombre: {
+                    "llamadas": e["llamadas"],
+                    "segundos": round(e["segundos"], 4),
+                    "max": round(e["max"], 4),
+                    "porcentaje": round(100 * e["segundos"] / duracion, 1) if duracion else 0.0,
+                }
+                for nombre, e in sorted(self._etapas.items(), key=lambda x: -x[1]["segundos"])
+            }
+            contadores = dict(self._contadores)
+        ritmo = {
+            f"{nombre}_por_segundo": round(n / duracion, 3) if duracion else 0.0
+            for nombre, n in contadores.items()
+        }
+        return {
+            "scraper": self.scraper,
+            "busqueda": self.busqueda,
+            "inicio": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.inicio)),
+            "duracion": round(duracion, 3),
+            "etapas": etapas,
+            "contadores": contadores,
+            "ritmo": ritmo,
+        }
+
+    def guardar_json(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(self.resumen(), f, ensure_ascii=False, indent=4)
+        return ruta
+
+    def guardar_prometheus(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(texto_prometheus([self.resumen()]))
+        return ruta
+
+    def log(self, log_func, etapas=4, prefijo="⏱️ "):
+        r = self.resumen()
+        partes = [
+            f"{nombre} {e['segundos']:.1f}s ({e['porcentaje']:.0f}%)"
+            for nombre, e in list(r["etapas"].items())[:etapas]
+        ]
+        log_func(f"{prefijo}{r['duracion']:.1f}s: " + ", ".join(partes))
+
+# ---------------- FORMATO PROMETHEUS ----------------
+
+def _etiqueta(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def texto_prometheus(resumenes, prefijo="scraper"):
+    """
+    Formato de texto de Prometheus (p.ej. para el textfile collector de
+    node_exporter) a partir de uno o varios MetricasEjecucion.resumen().
+    """
+    familias = [
+        (f"{prefijo}_etapa_segundos_total", "counter", "Segundos acumulados por etapa"),
+        (f"{prefijo}_etapa_llamadas_total", "counter", "Veces que se ha ejecutado cada etapa"),
+        (f"{prefijo}_etapa_segundos_max", "gauge", "Duración máxima de una ejecución de la etapa"),
+        (f"{prefijo}_eventos_total", "counter", "Contadores de la ejecución (páginas, empresas...)"),
+        (f"{prefijo}_duracion_segundos", "gauge", "Duración total de la ejecución"),
+    ]
+    muestras = {nombre: [] for nombre, _, _ in familias}
+    for r in resumenes:
+        base = f'scraper="{_etiqueta(r["scraper"])}",busqueda="{_etiqueta(r["busqueda"])}"'
+        for etapa, e in r["etapas"].items():
+            etiquetas = f'{{{base},etapa="{_etiqueta(etapa)}"}}'
+            muestras[f"{prefijo}_etapa_segundos_total"].append(f"{etiquetas} {e['segundos']}")
+            muestras[f"{prefijo}_etapa_llamadas_total"].append(f"{etiquetas} {e['llamadas']}")
+            muestras[f"{prefijo}_etapa_segundos_max"].append(f"{etiquetas} {e['max']}")
+        for evento, n in r["contadores"].items():
+            muestras[f"{prefijo}_eventos_total"].append(f'{{{base},evento="{_etiqueta(evento)}"}} {n}')
+        muestras[f"{prefijo}_duracion_segundos"].append(f"{{{base}}} {r['duracion']}")
+
+    lineas = []
+    for nombre, tipo, ayuda in familias:
+        if not muestras[nombre]:
+            continue
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} {tipo}")
+        lineas.extend(f"{nombre}{m}" for m in muestras[nombre])
+    return "\n".join(lineas) + "\n"
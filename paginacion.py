@@ -0,0 +1,100 @@
+import hashlib
+import json
+import math
+import re
+import threading
+
+# ---------------- PATRONES ----------------
+
+# "1.234 resultados", también con etiquetas entre el número y la palabra
+_total_regex = re.compile(r"(\d{1,3}(?:\.\d{3})+|\d+)\s*(?:<[^>]*>\s*)*resultados\b", re.I)
+# Enlaces de paginación de Páginas Amarillas: .../all-nc/N o .../all-nc/"N"
+_pagina_enlace_regex = re.compile(r'/all-nc/(?:"|%22)?(\d+)')
+# Enlaces <a ...>texto</a>; el de la última página se reconoce por rel="last"
+# o por el texto "Última"/"Último" (el paginador solo enseña una ventana de
+# páginas alrededor de la actual, así que el mayor número visible no vale)
+_enlace_regex = re.compile(r"<a\b([^>]*)>(.{0,200}?)</a>", re.I | re.S)
+_rel_ultima_regex = re.compile(r"""\brel\s*=\s*["']?[^"'>]*\blast\b""", re.I)
+_texto_ultima_regex = re.compile(r"\b[uú]ltim[ao]\b", re.I)
+
+# ---------------- PLAN ----------------
+
+class PlanPaginas:
+    """
+    Decide hasta qué página merece la pena seguir. Con la página 1 fija el
+    límite real (total de resultados / tarjetas por página, o el enlace
+    explícito a la última página) y después detecta páginas que repiten las mismas
+    tarjetas que una anterior, por huella de contenido. Hasta leer la página
+    1 el hilo de prefetch espera (esperar_primera) para no pedir de más.
+    """
+
+    def __init__(self, max_paginas, patron_total=_total_regex, patron_enlace=_pagina_enlace_regex):
+        self.max_paginas = max_paginas
+        self.limite = max_paginas
+        self.patron_total = patron_total
+        self.patron_enlace = patron_enlace
+        self.total_resultados = None
+        self.ultima_enlazada = None
+        self._huellas = {}
+        self._primera_leida = threading.Event()
+
+    def pendiente(self, pagina):
+        return pagina <= self.limite
+
+    def esperar_primera(self):
+        self._primera_leida.wait()
+
+    def dar_por_leida(self):
+        """Libera a quien espere la página 1 aunque no se haya podido leer."""
+        self._primera_leida.set()
+
+    def restaurar(self, paginas, huellas):
+        """Al reanudar sin volver a la página 1: páginas anunciadas y huellas guardadas."""
+        if paginas is not None:
+            self.limite = min(self.limite, paginas)
+        self._huellas.update(huellas)
+        self.dar_por_leida()
+
+    def leer_primera(self, html, tarjetas_por_pagina):
+        """
+        Ajusta el límite con el HTML de la página 1. Devuelve las páginas que
+        anuncia el sitio, o None si no se ha podido saber.
+        """
+        paginas = None
+        m = self.patron_total.search(html)
+        if m:
+            self.total_resultados = int(m.group(1).replace(".", ""))
+            if tarjetas_por_pagina:
+                paginas = max(1, math.ceil(self.total_resultados / tarjetas_por_pagina))
+
+        self.ultima_enlazada = self._ultima_enlazada(html)
+        if paginas is None:
+            paginas = self.ultima_enlazada
+
+        if paginas is not None:
+            self.limite = min(self.limite, paginas)
+        self.dar_por_leida()
+        return paginas
+
+    def _ultima_enlazada(self, html):
+        """Página del enlace "última página" del paginador, o None si no lo hay."""
+        for atributos, texto in _enlace_regex.findall(html):
+            texto = re.sub(r"<[^>]*>", " ", texto)
+            if _rel_ultima_regex.search(atributos) or _texto_ultima_regex.search(texto):
+                m = self.patron_enlace.search(atributos)
+                if m:
+                    return int(m.group(1))
+        return None
+
+    @staticmethod
+    def huella(empresas):
+        datos = json.dumps(empresas, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(datos.encode("utf-8")).hexdigest()
+
+    def repetida(self, pagina, empresas):
+        """Número de una página anterior con las mismas tarjetas, o None (y la registra)."""
+        huella = self.huella(empresas)
+        anterior = self._huellas.get(huella)
+        if anterior is None:
+            self._huellas[huella] = pagina
+        return anterior
@@ -0,0 +1,115 @@
+import re
+import time
+import unicodedata
+from urllib.parse import urljoin, urlparse
+
+# ---------------- CONFIGURACIÓN ----------------
+
+CONTACTO_CONFIG = {
+    "paginas": 3,    # páginas del mismo dominio que se miran tras la portada (0 = solo portada)
+    "plazo": 6.0,    # segundos máximos para todas ellas, por empresa
+    # Puntos por palabra en la ruta o el texto del enlace
+    "palabras": {
+        "contacto": 10, "contact": 10, "contacta": 10,
+        "aviso-legal": 8, "aviso_legal": 8, "avisolegal": 8, "legal": 5,
+        "quienes-somos": 4, "nosotros": 4, "about": 3, "empresa": 2,
+        "privacidad": 2, "privacy": 2,
+    },
+}
+
+_EXTENSIONES_IGNORADAS = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".ico",
+    ".css", ".js", ".zip", ".doc", ".docx", ".xls", ".xlsx", ".mp4", ".mp3",
+)
+
+# Enlaces sin parsear el HTML: href y el texto hasta la siguiente etiqueta
+_enlace_regex = re.compile(
+    rb"""<a\s[^>]*?href\s*=\s*["']([^"'<>\s]+)["'][^>]*>([^<]{0,120})""", re.I
+)
+
+# ---------------- RANKING DE ENLACES ----------------
+
+def _sin_acentos(texto):
+    return "".join(
+        c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c)
+    ).lower()
+
+
+def _mismo_dominio(host, dominio):
+    host = host.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host == dominio
+
+
+def puntuar_enlace(href, texto, palabras):
+    ruta = _sin_acentos(urlparse(href).path)
+    texto = _sin_acentos(texto)
+    return sum(p for palabra, p in palabras.items() if palabra in ruta or palabra in texto)
+
+
+def enlaces_contacto(html, url_base, dominio, config=None):
+    """
+    URLs del mismo dominio con más pinta de tener los datos de contacto,
+    de mejor a peor, como mucho config["paginas"]. `html` son los bytes de la portada.
+    """
+    cfg = dict(CONTACTO_CONFIG)
+    cfg.update(config or {})
+    if cfg["paginas"] <= 0 or not html:
+        return []
+
+    base = urlparse(url_base)._replace(query="", fragment="").geturl()
+    candidatos = {}
+    for href, texto in _enlace_regex.findall(html):
+        href = href.decode("ascii", "ignore").strip()
+        if not href or href.startswith(("#", "mailto:", "tel:", "javascript:")):
+            continue
+        url = urljoin(url_base, href).split("#")[0]
+        partes = urlparse(url)
+        if partes.scheme not in ("http", "https") or not _mismo_dominio(partes.netloc, dominio):
+            continue
+        if partes.path.lower().endswith(_EXTENSIONES_IGNORADAS) or url.rstrip("/") == base.rstrip("/"):
+            continue
+        puntos = puntuar_enlace(url, texto.decode("utf-8", "ignore"), cfg["palabras"])
+        if puntos > candidatos.get(url, 0):
+            candidatos[url] = puntos
+
+    # sorted es estable: a igualdad de puntos manda el orden en la página
+    ranking = sorted(candidatos.items(), key=lambda x: -x[1])
+    return [url for url, _ in ranking[: cfg["paginas"]]]
+
+# ---------------- PÁGINAS PENDIENTES ----------------
+
+class PaginasContacto:
+    """
+    Lo que queda por mirar de una empresa cuya portada no tenía email:
+    buscar(url, timeout) sobre cada una de `urls` dentro de `plazo` segundos.
+    terminar(email, completo) recibe el primer email encontrado (o None) y si
+    se llegó a mirar todas las páginas (False si se agotó el plazo o alguna
+    descarga falló con una excepción), y devuelve el email final.
+    Quien la recibe decide cómo repartir las descargas: enriquecimiento_async
+    las pasa por sus cupos global y por host; resolver() las hace en serie.
+    """
+
+    def __init__(self, urls, buscar, plazo, terminar):
+        self.urls = urls
+        self.buscar = buscar
+        self.plazo = plazo
+        self.terminar = terminar
+
+    def resolver(self):
+        """Mira las páginas una tras otra en este hilo, sin hilos extra."""
+        limite = time.monotonic() + self.plazo
+        completo = True
+        for url in self.urls:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                return self.terminar(None, False)
+            try:
+                resultado = self.buscar(url, restante)
+            except Exception:
+                completo = False
+                continue
+            if resultado:
+                return self.terminar(resultado, True)
+        return self.terminar(None, completo)
@@ -0,0 +1,180 @@
+import os
+
+# ---------------- CONFIGURACIÓN ----------------
+
+# Orden de preferencia cuando no se fuerza ninguno (variable SCRAPER_PARSER).
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+_TEXTO_IGNORADO = ("script", "style", "template")
+
+_backend = None
+
+# ---------------- SELECCIÓN DE BACKEND ----------------
+
+def backend_disponible(nombre):
+    try:
+        if nombre == "selectolax":
+            import selectolax  # noqa: F401
+        elif nombre == "lxml":
+            import lxml  # noqa: F401
+        elif nombre != "html.parser":
+            return False
+        return True
+    except ImportError:
+        return False
+
+
+def backends_disponibles():
+    return [b for b in BACKENDS if backend_disponible(b)]
+
+
+def seleccionar_backend(nombre=None):
+    """
+    Fija el backend de parseo. Sin nombre usa SCRAPER_PARSER o, si no está
+    definida, el más rápido instalado. Si el pedido no está instalado se cae
+    a BeautifulSoup con html.parser.
+    """
+    global _backend
+    nombre = nombre or os.getenv("SCRAPER_PARSER")
+    if nombre:
+        _backend = nombre if backend_disponible(nombre) else "html.parser"
+    else:
+        _backend = backends_disponibles()[0]
+    return _backend
+
+
+def backend_actual():
+    return _backend or seleccionar_backend()
+
+# ---------------- PARSEO ----------------
+
+def crear_soup(html):
+    """
+    BeautifulSoup con el builder más rápido instalado (lxml o html.parser).
+    Para código que usa toda la API de bs4 (find, find_all con regex...).
+    """
+    from bs4 import BeautifulSoup
+
+    builder = "lxml" if backend_disponible("lxml") else "html.parser"
+    return BeautifulSoup(html, builder)
+
+
+def parsear(html, backend=None):
+    """
+    Parsea `html` con el backend indicado (o el actual) y devuelve un nodo raíz
+    con la API común: select, select_one, get, [attr] y get_text.
+    Los extractores que solo usan esa API dan la misma salida en todos los backends.
+    """
+    backend = backend or backend_actual()
+    if backend == "selectolax":
+        return NodoSelectolax(_parser_selectolax()(html or "").root)
+
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html or "", backend)
+
+
+def iterar_elementos(nodo):
+    """
+    Recorre una sola vez los elementos descendientes de `nodo` en orden de documento
+    y devuelve (nombre, attrs, elemento). En bs4 class llega como lista y en
+    selectolax como str; los atributos sin valor llegan como "" o None.
+    """
+    if isinstance(nodo, NodoSelectolax):
+        if nodo.nodo is None:
+            return
+        recorrido = nodo.nodo.traverse()
+        next(recorrido, None)  # traverse() empieza por el propio nodo
+        for n in recorrido:
+            tag = n.tag
+            if tag[0] == "-":  # -text, -comment...
+                continue
+            yield tag, n.attributes, NodoSelectolax(n)
+    else:
+        for d in nodo.descendants:
+            if d.name is not None:
+                yield d.name, d.attrs, d
+
+
+def _parser_selectolax():
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborHTMLParser
+    except ImportError:
+        from selectolax.parser import HTMLParser
+        return HTMLParser
+
+# ---------------- ADAPTADOR SELECTOLAX ----------------
+
+class NodoSelectolax:
+    """Envuelve un nodo de selectolax con el subconjunto de la API de bs4 que usan los extractores."""
+
+    __slots__ = ("nodo",)
+
+    def __init__(self, nodo):
+        self.nodo = nodo
+
+    @property
+    def name(self):
+        return self.nodo.tag if self.nodo is not None else None
+
+    def select(self, css):
+        if self.nodo is None:
+            return []
+        # Lexbor devuelve dos veces el nodo que casa con varios selectores de
+        # una lista "a, b"; bs4 no repite, así que se deduplica en orden.
+        vistos = set()
+        nodos = []
+        for n in self.nodo.css(css):
+            if n.mem_id not in vistos:
+                vistos.add(n.mem_id)
+                nodos.append(NodoSelectolax(n))
+        return nodos
+
+    def select_one(self, css):
+        if self.nodo is None:
+            return None
+        n = self.nodo.css_first(css)
+        return NodoSelectolax(n) if n is not None else None
+
+    def get(self, atributo, default=None):
+        if self.nodo is None:
+            return default
+        attrs = self.nodo.attributes
+        if atributo not in attrs:
+            return default
+        valor = attrs[atributo]
+        if valor is None:
+            valor = ""
+        if atributo == "class":
+            # bs4 trata class como atributo multivalor
+            return valor.split()
+        return valor
+
+    def has_attr(self, atributo):
+        return self.nodo is not None and atributo in self.nodo.attributes
+
+    def __getitem__(self, atributo):
+        valor = self.get(atributo)
+        if valor is None:
+            raise KeyError(atributo)
+        return valor
+
+    def get_text(self, separator="", strip=False):
+        """Mismo criterio que bs4: solo nodos de texto, sin script/style ni comentarios."""
+        if self.nodo is None:
+            return ""
+        partes = []
+        for n in self.nodo.traverse(include_text=True):
+            if n.tag != "-text":
+                continue
+            padre = n.parent
+            if padre is not None and padre.tag in _TEXTO_IGNORADO:
+                continue
+            texto = n.text_content or ""
+            if strip:
+                texto = texto.strip()
+                if not texto:
+                    continue
+            partes.append(texto)
+        return separator.join(partes)
@@ -0,0 +1,68 @@
+import queue
+import threading
+
+# ---------------- PREFETCH ----------------
+
+_FIN = object()
+
+
+def paginas_prefetch(paginas, descargar, profundidad=2):
+    """
+    Recorre `paginas` (iterable de (numero, url)) y devuelve (numero, url, respuesta).
+    Con profundidad > 0 un hilo productor descarga hasta `profundidad` páginas por
+    delante mientras el consumidor parsea la actual; con 0 descarga en serie.
+    Si la descarga falla, en lugar de la respuesta se devuelve la excepción.
+
+    Usar con contextlib.closing() si el bucle puede cortarse antes de tiempo:
+    al cerrar el generador se detiene el productor.
+    """
+    if profundidad <= 0:
+        for numero, url in paginas:
+            yield numero, url, _descargar_seguro(descargar, url)
+        return
+
+    cola = queue.Queue(maxsize=profundidad)
+    parar = threading.Event()
+
+    def poner(item):
+        while not parar.is_set():
+            try:
+                cola.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def productor():
+        try:
+            for numero, url in paginas:
+                if parar.is_set():
+                    return
+                if not poner((numero, url, _descargar_seguro(descargar, url))):
+                    return
+        finally:
+            poner(_FIN)
+
+    hilo = threading.Thread(target=productor, name="prefetch-paginas", daemon=True)
+    hilo.start()
+    try:
+        while True:
+            item = cola.get()
+            if item is _FIN:
+                return
+            yield item
+    finally:
+        parar.set()
+        # Vaciar la cola desbloquea al productor si estaba esperando hueco.
+        while True:
+            try:
+                cola.get_nowait()
+            except queue.Empty:
+                break
+
+
+def _descargar_seguro(descargar, url):
+    try:
+        return descargar(url)
+    except Exception as exc:
+        return exc
@@ -0,0 +1,284 @@
+"""
+Salida en streaming de resultados: una línea JSON compacta por empresa,
+escrita y volcada a disco en cuanto la empresa está terminada.
+
+Conversión al formato clásico {"localidad", "tipo_empresa", "resultados"}:
+
+    python salida_jsonl.py resultados/Fichero.jsonl[.gz] [salida.json]
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import textwrap
+import zlib
+from pathlib import Path
+
+_WBITS_GZIP = 16 + zlib.MAX_WBITS
+_CABECERA_GZIP = b"\x1f\x8b\x08"
+_BLOQUE = 64 * 1024
+
+# ---------------- ESCRITURA ----------------
+
+class SalidaJSONL:
+    """
+    Sink JSON Lines (opcionalmente gzip). La primera línea de un fichero nuevo
+    guarda localidad y tipo_empresa en {"_meta": {...}}; el resto son empresas.
+    Cada escritura se vuelca a disco, así un corte no pierde lo ya terminado.
+    Al reanudar se recorta antes lo que dejó a medias el corte (línea cortada
+    o miembro gzip sin cerrar) para no escribir detrás de datos rotos.
+    """
+
+    def __init__(self, ruta, localidad="No disponible", tipo_empresa="No disponible",
+                 comprimir=False, reiniciar=False):
+        ruta = Path(ruta)
+        if comprimir and ruta.suffix != ".gz":
+            ruta = ruta.with_name(ruta.name + ".gz")
+        self.ruta = ruta
+        self.comprimir = ruta.suffix == ".gz"
+        self.total = 0
+
+        rescatado = b""
+        if not reiniciar and ruta.exists():
+            if self.comprimir:
+                rescatado = _recortar_gzip(ruta)
+            else:
+                _recortar_texto(ruta)
+        modo = "wb" if reiniciar else "ab"
+        nuevo = reiniciar or not ruta.exists() or (ruta.stat().st_size == 0 and not rescatado)
+        self._raw = open(ruta, modo)
+        self._f = gzip.GzipFile(fileobj=self._raw, mode=modo) if self.comprimir else self._raw
+        if rescatado:
+            # Líneas completas de los miembros rotos: pasan al miembro nuevo
+            self._f.write(rescatado)
+            self._volcar()
+        if nuevo:
+            self._escribir_linea({"_meta": {"localidad": localidad, "tipo_empresa": tipo_empresa}})
+
+    def _escribir_linea(self, obj):
+        linea = json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self._f.write(linea.encode("utf-8"))
+        self._volcar()
+
+    def _volcar(self):
+        self._f.flush()  # en gzip hace Z_SYNC_FLUSH: el bloque queda legible
+        if self.comprimir:
+            self._raw.flush()
+        os.fsync(self._raw.fileno())
+
+    def escribir(self, empresa):
+        self._escribir_linea(empresa)
+        self.total += 1
+
+    def cerrar(self):
+        if self._f is not self._raw:
+            self._f.close()
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+# ---------------- REPARACIÓN TRAS UN CORTE ----------------
+
+def _recortar_texto(ruta):
+    """Deja el fichero terminado en su última línea completa."""
+    with open(ruta, "r+b") as f:
+        fin = pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            inicio = max(0, pos - _BLOQUE)
+            f.seek(inicio)
+            salto = f.read(pos - inicio).rfind(b"\n")
+            if salto != -1:
+                pos = inicio + salto + 1
+                break
+            pos = inicio
+        if pos != fin:
+            f.truncate(pos)
+
+
+def _recortar_gzip(ruta):
+    """
+    Recorta el fichero al final del último miembro gzip completo antes del
+    primero roto o sin cerrar. Devuelve las líneas completas que se pudieron
+    leer de ahí en adelante, para reescribirlas en el miembro nuevo.
+    """
+    datos = Path(ruta).read_bytes()
+    pos = 0
+    while pos < len(datos):
+        fin = _fin_miembro_gzip(datos, pos)
+        if fin is None:
+            lineas = _lineas_gzip(io.BytesIO(datos[pos:]))
+            rescatado = b"".join(linea for linea in lineas if linea.endswith(b"\n"))
+            with open(ruta, "r+b") as f:
+                f.truncate(pos)
+            return rescatado
+        pos = fin
+    return b""
+
+
+def _fin_miembro_gzip(datos, inicio):
+    """Dónde acaba el miembro que empieza en `inicio` (None si está sin cerrar o roto)."""
+    d = zlib.decompressobj(_WBITS_GZIP)
+    pos = inicio
+    try:
+        while pos < len(datos) and not d.eof:
+            d.decompress(datos[pos:pos + _BLOQUE])
+            pos = min(pos + _BLOQUE, len(datos))
+    except zlib.error:
+        return None
+    return pos - len(d.unused_data) if d.eof else None
+
+
+def _descomprimir(d, datos):
+    """
+    d.decompress que no pierde lo legible: ante datos corruptos devuelve
+    (texto descomprimido hasta el error, True). `d` queda inservible.
+    """
+    respaldo = d.copy()
+    try:
+        return d.decompress(datos), False
+    except zlib.error:
+        pass
+    # Se repite por trozos y, en el trozo que falla, byte a byte
+    partes = []
+    for i in range(0, len(datos), 256):
+        trozo = datos[i:i + 256]
+        copia = respaldo.copy()
+        try:
+            partes.append(respaldo.decompress(trozo))
+        except zlib.error:
+            for j in range(len(trozo)):
+                try:
+                    partes.append(copia.decompress(trozo[j:j + 1]))
+                except zlib.error:
+                    break
+            break
+    return b"".join(partes), True
+
+
+def _lineas_gzip(f):
+    """
+    Líneas de un gzip de varios miembros (uno por reanudación). Un miembro
+    roto o sin cerrar se lee hasta donde se pueda y se sigue en la siguiente
+    cabecera gzip; la línea que quedó a medias se descarta.
+    """
+    d = zlib.decompressobj(_WBITS_GZIP)
+    pendiente = b""
+    entrada = b""
+    while True:
+        if not entrada:
+            entrada = f.read(_BLOQUE)
+            if not entrada:
+                break
+        texto, error = _descomprimir(d, entrada)
+        *lineas, pendiente = (pendiente + texto).split(b"\n")
+        yield from (linea + b"\n" for linea in lineas)
+        if error:
+            pendiente = b""
+            siguiente = entrada.find(_CABECERA_GZIP, 1)
+            entrada = entrada[siguiente:] if siguiente != -1 else b""
+            d = zlib.decompressobj(_WBITS_GZIP)
+        elif d.eof:
+            entrada = d.unused_data
+            d = zlib.decompressobj(_WBITS_GZIP)
+        else:
+            entrada = b""
+    if pendiente:
+        yield pendiente
+
+# ---------------- LECTURA Y CONVERSIÓN ----------------
+
+def leer_jsonl(ruta):
+    """
+    Devuelve (meta, empresas) con empresas como generador. Tolera una última
+    línea incompleta y miembros gzip sin cerrar o corruptos (scrape interrumpido).
+    """
+    ruta = Path(ruta)
+    comprimido = ruta.suffix == ".gz"
+    f = open(ruta, "rb")
+
+    def lineas():
+        try:
+            yield from (_lineas_gzip(f) if comprimido else f)
+        finally:
+            f.close()
+
+    iterador = lineas()
+    meta = {}
+    primera = next(iterador, None)
+    if primera is not None:
+        try:
+            obj = json.loads(primera)
+        except ValueError:
+            obj = None
+        if isinstance(obj, dict) and "_meta" in obj:
+            meta = obj["_meta"]
+        else:
+            iterador = _encadenar([primera], iterador)
+
+    def empresas():
+        for linea in iterador:
+            if not linea.strip():
+                continue
+            try:
+                yield json.loads(linea)
+            except ValueError:
+                # Línea cortada por un crash: lo anterior sigue siendo válido
+                continue
+
+    return meta, empresas()
+
+
+def _encadenar(*iterables):
+    for it in iterables:
+        yield from it
+
+
+def convertir_a_json(ruta_jsonl, ruta_json=None, localidad=None, tipo_empresa=None):
+    """
+    Escribe el JSON clásico (mismo formato que json.dump(..., indent=4)) sin
+    cargar todas las empresas en memoria. Devuelve (ruta_json, total).
+    """
+    ruta_jsonl = Path(ruta_jsonl)
+    if ruta_json is None:
+        nombre = ruta_jsonl.name
+        for sufijo in (".gz", ".jsonl"):
+            if nombre.endswith(sufijo):
+                nombre = nombre[: -len(sufijo)]
+        ruta_json = ruta_jsonl.with_name(nombre + ".json")
+
+    meta, empresas = leer_jsonl(ruta_jsonl)
+    cabecera = {
+        "localidad": localidad or meta.get("localidad", "No disponible"),
+        "tipo_empresa": tipo_empresa or meta.get("tipo_empresa", "No disponible"),
+    }
+
+    total = 0
+    with open(ruta_json, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        for clave, valor in cabecera.items():
+            f.write(f"    {json.dumps(clave)}: {json.dumps(valor, ensure_ascii=False)},\n")
+        f.write('    "resultados": [')
+        for empresa in empresas:
+            f.write(",\n" if total else "\n")
+            f.write(textwrap.indent(json.dumps(empresa, ensure_ascii=False, indent=4), " " * 8))
+            total += 1
+        f.write("\n    ]\n}" if total else "]\n}")
+    return Path(ruta_json), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte una salida JSONL al JSON clásico")
+    parser.add_argument("jsonl", type=Path)
+    parser.add_argument("json", type=Path, nargs="?")
+    args = parser.parse_args()
+    ruta, total = convertir_a_json(args.jsonl, args.json)
+    print(f"{total} empresas guardadas en {ruta}")
+
+
+if __name__ == "__main__":
+    main()
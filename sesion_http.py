@@ -0,0 +1,196 @@
+import threading
+from urllib.parse import urlparse
+
+from cache_http import cache_global, log_estadisticas_cache
+from limitador import limitador_global
+
+# ---------------- CONFIGURACIÓN ----------------
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Language": "es-ES,es;q=0.9"
+}
+
+HTTP_CONFIG = {
+    "pool_hosts": 32,          # pools por host que se mantienen abiertos
+    "pool_conexiones": 10,     # conexiones keep-alive por host
+    "pool_bloqueante": False,  # True: espera a que quede libre una conexión del pool
+    "reintentos": 3,
+    "backoff": 0.5,            # 0.5s, 1s, 2s...
+    "reintentar_estados": (429, 500, 502, 503, 504),
+}
+
+_sesion = None
+_lock = threading.Lock()
+_pools_vistos = {}
+_peticiones_por_host = {}
+
+# ---------------- SESIÓN ----------------
+
+def crear_sesion(config=None, headers=None):
+    """Crea una sesión requests con pools keep-alive por host y política de reintentos."""
+    # requests se importa al crear la primera sesión, no al importar el módulo
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    cfg = dict(HTTP_CONFIG)
+    cfg.update(config or {})
+
+    retry = Retry(
+        total=cfg["reintentos"],
+        connect=cfg["reintentos"],
+        read=cfg["reintentos"],
+        status=cfg["reintentos"],
+        backoff_factor=cfg["backoff"],
+        status_forcelist=cfg["reintentar_estados"],
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=cfg["pool_hosts"],
+        pool_maxsize=cfg["pool_conexiones"],
+        pool_block=cfg["pool_bloqueante"],
+        max_retries=retry,
+    )
+
+    sesion = requests.Session()
+    sesion.headers.update(headers or HEADERS)
+    sesion.mount("http://", adapter)
+    sesion.mount("https://", adapter)
+    return sesion
+
+
+def configurar_sesion(config=None, headers=None):
+    """Sustituye la sesión compartida (p.ej. para cambiar tamaños de pool o reintentos)."""
+    global _sesion
+    with _lock:
+        if _sesion is not None:
+            _sesion.close()
+        _sesion = crear_sesion(config, headers)
+        _pools_vistos.clear()
+        _peticiones_por_host.clear()
+    return _sesion
+
+
+def obtener_sesion():
+    global _sesion
+    with _lock:
+        if _sesion is None:
+            _sesion = crear_sesion()
+        return _sesion
+
+
+def get(url, timeout=15, limitar=True, cache=True, **kwargs):
+    """
+    GET a través de la sesión compartida (reutiliza conexiones por host).
+    Con limitar=True espera antes su turno en el limitador por host.
+    Con cache=True (y sin stream) pasa por la cache en disco: las respuestas
+    dentro del TTL no tocan la red y el resto se revalida con ETag/Last-Modified.
+    """
+    cache_http = cache_global() if cache and not kwargs.get("stream") else None
+    if cache_http is None:
+        return _get_red(url, timeout, limitar, **kwargs)
+
+    headers = kwargs.pop("headers", None)
+    return cache_http.get(
+        url,
+        lambda cabeceras: _get_red(url, timeout, limitar, headers=cabeceras, **kwargs),
+        headers,
+    )
+
+
+def _get_red(url, timeout, limitar, **kwargs):
+    if limitar:
+        limitador_global().esperar(url)
+    sesion = obtener_sesion()
+    try:
+        return sesion.get(url, timeout=timeout, **kwargs)
+    finally:
+        _registrar_peticion(sesion, url)
+
+
+def cerrar_sesion():
+    global _sesion
+    with _lock:
+        if _sesion is not None:
+            _sesion.close()
+        _sesion = None
+
+# ---------------- ESTADÍSTICAS ----------------
+
+def _registrar_peticion(sesion, url):
+    try:
+        partes = urlparse(url)
+        host = partes.netloc.lower()
+        pools = sesion.get_adapter(url).poolmanager.pools
+        # requests crea los pools con pool_kwargs propios (TLS...), así que se
+        # buscan por esquema/host/puerto en lugar de pedir uno nuevo.
+        puerto = partes.port or (443 if partes.scheme == "https" else 80)
+        del_host = [
+            pools[clave] for clave in pools.keys()
+            if clave.key_scheme == partes.scheme
+            and clave.key_host == partes.hostname
+            and clave.key_port in (partes.port, puerto)
+        ]
+    except Exception:
+        return
+    with _lock:
+        _peticiones_por_host[host] = _peticiones_por_host.get(host, 0) + 1
+        # Guardamos la referencia al pool: si el PoolManager lo descarta,
+        # sus contadores siguen disponibles para el informe final.
+        for pool in del_host:
+            _pools_vistos.setdefault(id(pool), (host, pool, 0))
+
+
+def reiniciar_estadisticas():
+    """Pone a cero los contadores (conexiones y cache) sin cerrar las conexiones abiertas."""
+    cache_http = cache_global()
+    if cache_http is not None:
+        cache_http.reiniciar_estadisticas()
+    with _lock:
+        for clave, (host, pool, _) in list(_pools_vistos.items()):
+            _pools_vistos[clave] = (host, pool, getattr(pool, "num_connections", 0))
+        _peticiones_por_host.clear()
+
+
+def estadisticas_conexiones():
+    """
+    Devuelve {host: {"peticiones", "conexiones_nuevas", "reutilizadas"}}.
+    Las conexiones nuevas salen de los contadores de urllib3 de cada pool.
+    """
+    with _lock:
+        conexiones = {}
+        for host, pool, base in _pools_vistos.values():
+            nuevas = getattr(pool, "num_connections", 0) - base
+            conexiones[host] = conexiones.get(host, 0) + nuevas
+
+        stats = {}
+        for host, peticiones in _peticiones_por_host.items():
+            nuevas = min(conexiones.get(host, 0), peticiones)
+            stats[host] = {
+                "peticiones": peticiones,
+                "conexiones_nuevas": nuevas,
+                "reutilizadas": peticiones - nuevas,
+            }
+        return stats
+
+
+def log_estadisticas_conexiones(log_func):
+    stats = estadisticas_conexiones()
+    if not stats:
+        return
+    log_func("🔌 Reutilización de conexiones por host:")
+    for host, s in sorted(stats.items(), key=lambda kv: -kv[1]["peticiones"]):
+        ratio = s["reutilizadas"] / s["peticiones"] * 100 if s["peticiones"] else 0
+        log_func(
+            f"   {host}: {s['peticiones']} peticiones, "
+            f"{s['conexiones_nuevas']} conexiones nuevas, "
+            f"{s['reutilizadas']} reutilizadas ({ratio:.0f}%)"
+        )
+
+
+def log_estadisticas(log_func):
+    log_estadisticas_conexiones(log_func)
+    log_estadisticas_cache(log_func)